@@ -4,12 +4,14 @@ Contains data access layer and business logic layer
 """
 
 from .data_access_layer import (
+    ConnectionPool,
     DatabaseConnection,
     RepositoryFactory,
     BookRepository,
     ChapterRepository,
     PageRepository,
     ProcessingLogRepository,
+    ProcessingLogBuffer,
     BaseRepository,
     db_connection,
     repository_factory
@@ -24,12 +26,14 @@ from .business_logic_layer import (
 )
 
 __all__ = [
+    'ConnectionPool',
     'DatabaseConnection',
     'RepositoryFactory', 
     'BookRepository',
     'ChapterRepository',
     'PageRepository',
     'ProcessingLogRepository',
+    'ProcessingLogBuffer',
     'BaseRepository',
     'db_connection',
     'repository_factory',
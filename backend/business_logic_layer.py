@@ -4,13 +4,20 @@ Contains all business logic and domain operations.
 This layer uses the Data Access Layer for database operations.
 """
 
-from typing import List, Dict, Optional, Any, Tuple
-from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple, Hashable, Sequence
+from collections import defaultdict, OrderedDict
+from itertools import repeat
+import os
 import base64
+import copy
 import json
+import sqlite3
+import threading
+import time
 from datetime import datetime
 
 try:
+    from .utils import sniff_image_mime
     from .data_access_layer import (
         RepositoryFactory, 
         BookRepository, 
@@ -19,6 +26,7 @@ try:
         ProcessingLogRepository
     )
 except ImportError:
+    from utils import sniff_image_mime
     from data_access_layer import (
         RepositoryFactory, 
         BookRepository, 
@@ -27,6 +35,41 @@ except ImportError:
         ProcessingLogRepository
     )
 
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live cached value or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
 class BookService:
     """Service for book-related business logic."""
     
@@ -34,33 +77,27 @@ class BookService:
         self.book_repo = repository_factory.get_book_repository()
         self.chapter_repo = repository_factory.get_chapter_repository()
         self.page_repo = repository_factory.get_page_repository()
-        self.log_repo = repository_factory.get_processing_log_repository()
+        self.log_buffer = repository_factory.get_processing_log_buffer()
     
     def create_book(self, book_id: str, title: str, author: str = None, 
                    genre: str = None, year: str = None, page_count: int = None,
                    cover_image_path: str = None) -> bool:
         """Create a new book with metadata."""
         try:
-            # Load cover image if provided
-            cover_data = None
-            cover_type = None
-            if cover_image_path and Path(cover_image_path).exists():
-                with open(cover_image_path, 'rb') as f:
-                    cover_data = f.read()
-                cover_type = f"image/{Path(cover_image_path).suffix[1:]}"
-            
             book_data = {
                 'book_id': book_id,
                 'title': title,
                 'author': author,
                 'genre': genre,
                 'year': year,
-                'page_count': page_count,
-                'cover_image_data': cover_data,
-                'cover_image_type': cover_type
+                'page_count': page_count
             }
             
             self.book_repo.create(book_data)
+            
+            # Stream cover image into the database if provided
+            if cover_image_path and os.path.exists(cover_image_path):
+                self.set_cover_from_file(book_id, cover_image_path)
             self._log_processing(book_id, 'book_creation', 'completed', f"Book '{title}' created successfully")
             return True
             
@@ -68,6 +105,16 @@ class BookService:
             self._log_processing(book_id, 'book_creation', 'failed', f"Failed to create book: {str(e)}")
             return False
     
+    def set_cover_from_file(self, book_id: str, cover_image_path: str) -> bool:
+        """Stream an image file into the book's cover; non-image files are ignored."""
+        with open(cover_image_path, 'rb') as f:
+            cover_type = sniff_image_mime(f.read(12))
+            if not cover_type:
+                return False
+            f.seek(0)
+            written = self.book_repo.write_cover_stream(book_id, f, os.fstat(f.fileno()).st_size, cover_type)
+        return written
+    
     def get_book(self, book_id: str) -> Optional[Dict[str, Any]]:
         """Get book information."""
         return self.book_repo.get_by_id(book_id)
@@ -84,6 +131,8 @@ class BookService:
         """Delete book and all associated data."""
         try:
             self._log_processing(book_id, 'book_deletion', 'in_progress', "Starting book deletion")
+            # Write pending logs now so none for this book land after the delete
+            self.log_buffer.flush()
             success = self.book_repo.delete(book_id)
             if success:
                 self._log_processing(book_id, 'book_deletion', 'completed', "Book deleted successfully")
@@ -96,14 +145,14 @@ class BookService:
     
     def get_book_cover(self, book_id: str) -> Tuple[Optional[bytes], Optional[str]]:
         """Get book cover image data and type."""
-        book = self.get_book(book_id)
-        if book and book.get('cover_image_data'):
-            return book['cover_image_data'], book.get('cover_image_type')
+        cover_data, cover_type = self.book_repo.get_cover(book_id)
+        if cover_data:
+            return cover_data, cover_type
         return None, None
     
     def _log_processing(self, book_id: str, stage: str, status: str, message: str):
         """Log processing activity."""
-        self.log_repo.create({
+        self.log_buffer.append({
             'book_id': book_id,
             'stage': stage,
             'status': status,
@@ -116,20 +165,17 @@ class ChapterService:
     def __init__(self, repository_factory: RepositoryFactory):
         self.chapter_repo = repository_factory.get_chapter_repository()
         self.page_repo = repository_factory.get_page_repository()
-        self.log_repo = repository_factory.get_processing_log_repository()
+        self.log_buffer = repository_factory.get_processing_log_buffer()
     
     def create_chapters(self, book_id: str, chapters: List[Dict[str, Any]]) -> bool:
         """Create chapters for a book."""
         try:
-            for i, chapter in enumerate(chapters):
-                chapter_data = {
-                    'book_id': book_id,
-                    'chapter_index': i,
-                    'title': chapter.get('title', f'Chapter {i+1}'),
-                    'start_page': chapter.get('start_page', 1),
-                    'end_page': chapter.get('end_page', 1)
-                }
-                self.chapter_repo.create(chapter_data)
+            chapter_rows = [
+                (book_id, i, chapter.get('title', f'Chapter {i+1}'),
+                 chapter.get('start_page', 1), chapter.get('end_page', 1))
+                for i, chapter in enumerate(chapters)
+            ]
+            self.chapter_repo.create_many_tuples(chapter_rows)
             
             self._log_processing(book_id, 'chapter_creation', 'completed', f"Created {len(chapters)} chapters")
             return True
@@ -139,13 +185,18 @@ class ChapterService:
             return False
     
     def get_chapters(self, book_id: str) -> List[Dict[str, Any]]:
-        """Get all chapters for a book."""
-        return self.chapter_repo.get_by_book(book_id)
+        """Get all chapters for a book (metadata only; use get_chapter_audio for audio)."""
+        return self.chapter_repo.list_meta(book_id)
+    
+    def get_chapters_for_books(self, book_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get chapters for several books in one query."""
+        if not book_ids:
+            return []
+        return self.chapter_repo.list_meta_for_books(book_ids)
     
     def get_chapter_text(self, book_id: str, start_page: int, end_page: int) -> str:
         """Get combined text for a chapter."""
-        pages = self.page_repo.get_by_chapter(book_id, start_page, end_page)
-        return "\n\n".join(page['text_content'] for page in pages if page.get('text_content'))
+        return self.page_repo.get_text_joined(book_id, start_page, end_page)
     
     def update_chapter_summary(self, book_id: str, chapter_index: int, summary_text: str) -> bool:
         """Update chapter with summary."""
@@ -158,6 +209,16 @@ class ChapterService:
             self._log_processing(book_id, 'summarization', 'failed', f"Failed to update chapter summary: {str(e)}")
             return False
     
+    def update_chapter_summaries(self, book_id: str, summaries: Dict[int, str]) -> bool:
+        """Update many chapters' summaries at once, keyed by chapter index."""
+        try:
+            updated = self.chapter_repo.update_summaries_many(book_id, summaries)
+            self._log_processing(book_id, 'summarization', 'completed', f"{updated} chapters summarized")
+            return True
+        except Exception as e:
+            self._log_processing(book_id, 'summarization', 'failed', f"Failed to update chapter summaries: {str(e)}")
+            return False
+    
     def update_chapter_audio(self, book_id: str, chapter_index: int, audio_data: bytes, audio_format: str = 'audio/wav') -> bool:
         """Update chapter with audio data."""
         try:
@@ -169,17 +230,48 @@ class ChapterService:
             self._log_processing(book_id, 'audio_generation', 'failed', f"Failed to update chapter audio: {str(e)}")
             return False
     
+    def update_chapter_audio_from_file(self, book_id: str, chapter_index: int, file_path: str,
+                                       audio_format: str = 'audio/wav') -> bool:
+        """Update chapter audio by streaming it from a file on disk."""
+        try:
+            with open(file_path, 'rb') as f:
+                success = self.chapter_repo.write_audio_stream(book_id, chapter_index, f, audio_format)
+            if success:
+                self._log_processing(book_id, 'audio_generation', 'completed', f"Chapter {chapter_index} audio generated")
+            return success
+        except Exception as e:
+            self._log_processing(book_id, 'audio_generation', 'failed', f"Failed to update chapter audio: {str(e)}")
+            return False
+    
     def get_chapter_audio(self, book_id: str, chapter_index: int) -> Tuple[Optional[bytes], Optional[str]]:
         """Get chapter audio data and format."""
-        chapters = self.chapter_repo.get_by_book(book_id)
-        for chapter in chapters:
-            if chapter['chapter_index'] == chapter_index:
-                return chapter.get('audio_data'), chapter.get('audio_format')
-        return None, None
+        return self.chapter_repo.get_one_audio(book_id, chapter_index)
+    
+    def export_chapter_audio(self, book_id: str, chapter_index: int, out) -> Optional[str]:
+        """Stream chapter audio into a binary file object; returns the audio format, or None if absent."""
+        return self.chapter_repo.read_audio_into(book_id, chapter_index, out)
     
     def get_processing_stats(self, book_id: str) -> Dict[str, int]:
         """Get processing statistics for a book."""
-        chapters = self.get_chapters(book_id)
+        return self.stats_from_counts(self.chapter_repo.count_by_status(book_id))
+    
+    @staticmethod
+    def stats_from_counts(counts: Dict[str, int]) -> Dict[str, int]:
+        """Build processing statistics from per-status chapter counts."""
+        total = sum(counts.values())
+        completed = counts.get('completed', 0)
+        summarized = counts.get('summarized', 0)
+        
+        return {
+            'total_chapters': total,
+            'completed': completed,
+            'summarized': summarized,
+            'pending': total - completed - summarized
+        }
+    
+    @staticmethod
+    def compute_processing_stats(chapters: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Compute processing statistics from already-loaded chapters."""
         total = len(chapters)
         completed = sum(1 for ch in chapters if ch.get('processing_status') == 'completed')
         summarized = sum(1 for ch in chapters if ch.get('processing_status') == 'summarized')
@@ -194,7 +286,7 @@ class ChapterService:
     
     def _log_processing(self, book_id: str, stage: str, status: str, message: str):
         """Log processing activity."""
-        self.log_repo.create({
+        self.log_buffer.append({
             'book_id': book_id,
             'stage': stage,
             'status': status,
@@ -206,18 +298,16 @@ class PageService:
     
     def __init__(self, repository_factory: RepositoryFactory):
         self.page_repo = repository_factory.get_page_repository()
-        self.log_repo = repository_factory.get_processing_log_repository()
+        self.log_buffer = repository_factory.get_processing_log_buffer()
     
     def create_pages(self, book_id: str, pages: List[Dict[str, Any]]) -> bool:
         """Create pages for a book."""
         try:
-            for page in pages:
-                page_data = {
-                    'book_id': book_id,
-                    'page_number': page.get('page_number', 1),
-                    'text_content': page.get('text', '')
-                }
-                self.page_repo.create(page_data)
+            # Rows are generated straight into executemany (one transaction), never held as a list
+            self.page_repo.create_many_tuples(
+                (book_id, page.get('page_number', 1), page.get('text', ''))
+                for page in pages
+            )
             
             self._log_processing(book_id, 'page_extraction', 'completed', f"Extracted {len(pages)} pages")
             return True
@@ -226,17 +316,44 @@ class PageService:
             self._log_processing(book_id, 'page_extraction', 'failed', f"Failed to create pages: {str(e)}")
             return False
     
-    def get_pages(self, book_id: str) -> List[Dict[str, Any]]:
-        """Get all pages for a book."""
+    def create_page_texts(self, book_id: str, texts: Sequence[str],
+                          page_numbers: Optional[Sequence[int]] = None) -> bool:
+        """Create pages for a book from parallel page-number/text columns (numbers default to 1..n)."""
+        try:
+            if page_numbers is None:
+                page_numbers = range(1, len(texts) + 1)
+            self.page_repo.create_many_tuples(zip(repeat(book_id), page_numbers, texts))
+            
+            self._log_processing(book_id, 'page_extraction', 'completed', f"Extracted {len(texts)} pages")
+            return True
+            
+        except Exception as e:
+            self._log_processing(book_id, 'page_extraction', 'failed', f"Failed to create pages: {str(e)}")
+            return False
+    
+    def create_pages_from_json(self, book_id: str, pages_json: str) -> Optional[int]:
+        """Create pages for a book from raw pages.json text; returns the page count, or None on failure."""
+        try:
+            count = self.page_repo.create_many_from_json(book_id, pages_json)
+            
+            self._log_processing(book_id, 'page_extraction', 'completed', f"Extracted {count} pages")
+            return count
+            
+        except Exception as e:
+            self._log_processing(book_id, 'page_extraction', 'failed', f"Failed to create pages: {str(e)}")
+            return None
+    
+    def get_pages(self, book_id: str) -> List[sqlite3.Row]:
+        """Get all pages for a book (read-only rows; use dict(row) to serialize)."""
         return self.page_repo.get_by_book(book_id)
     
-    def get_chapter_pages(self, book_id: str, start_page: int, end_page: int) -> List[Dict[str, Any]]:
+    def get_chapter_pages(self, book_id: str, start_page: int, end_page: int) -> List[sqlite3.Row]:
         """Get pages for a specific chapter."""
         return self.page_repo.get_by_chapter(book_id, start_page, end_page)
     
     def _log_processing(self, book_id: str, stage: str, status: str, message: str):
         """Log processing activity."""
-        self.log_repo.create({
+        self.log_buffer.append({
             'book_id': book_id,
             'stage': stage,
             'status': status,
@@ -246,19 +363,40 @@ class PageService:
 class ProcessingService:
     """Service for processing-related business logic."""
     
-    def __init__(self, repository_factory: RepositoryFactory):
+    RECENT_LOG_LIMIT = 10
+    
+    def __init__(self, repository_factory: RepositoryFactory,
+                 book_service: Optional[BookService] = None,
+                 chapter_service: Optional[ChapterService] = None,
+                 page_service: Optional[PageService] = None):
         self.log_repo = repository_factory.get_processing_log_repository()
-        self.book_service = BookService(repository_factory)
-        self.chapter_service = ChapterService(repository_factory)
-        self.page_service = PageService(repository_factory)
+        self.log_buffer = repository_factory.get_processing_log_buffer()
+        self.book_service = book_service or BookService(repository_factory)
+        self.chapter_service = chapter_service or ChapterService(repository_factory)
+        self.page_service = page_service or PageService(repository_factory)
     
     def get_processing_logs(self, book_id: str) -> List[Dict[str, Any]]:
         """Get processing logs for a book."""
+        self.log_buffer.flush()
         return self.log_repo.get_by_book(book_id)
     
+    def get_logs_for_books(self, book_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get processing logs for several books in one query."""
+        if not book_ids:
+            return []
+        self.log_buffer.flush()
+        return self.log_repo.get_by_books(book_ids)
+    
+    def get_recent_logs_for_books(self, book_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the most recent processing logs for several books in one query."""
+        if not book_ids:
+            return []
+        self.log_buffer.flush()
+        return self.log_repo.get_recent_for_books(book_ids, self.RECENT_LOG_LIMIT)
+    
     def log_processing_start(self, book_id: str, stage: str, message: str = None):
         """Log the start of a processing stage."""
-        self.log_repo.create({
+        self.log_buffer.append_and_flush({
             'book_id': book_id,
             'stage': stage,
             'status': 'in_progress',
@@ -267,7 +405,7 @@ class ProcessingService:
     
     def log_processing_complete(self, book_id: str, stage: str, message: str = None):
         """Log the completion of a processing stage."""
-        self.log_repo.create({
+        self.log_buffer.append({
             'book_id': book_id,
             'stage': stage,
             'status': 'completed',
@@ -276,7 +414,7 @@ class ProcessingService:
     
     def log_processing_error(self, book_id: str, stage: str, error_message: str):
         """Log a processing error."""
-        self.log_repo.create({
+        self.log_buffer.append({
             'book_id': book_id,
             'stage': stage,
             'status': 'failed',
@@ -285,9 +423,14 @@ class ProcessingService:
     
     def get_processing_status(self, book_id: str) -> Dict[str, Any]:
         """Get overall processing status for a book."""
-        logs = self.get_processing_logs(book_id)
-        stats = self.chapter_service.get_processing_stats(book_id)
-        
+        self.log_buffer.flush()
+        counts, recent_logs = self.log_repo.get_status_snapshot(book_id, self.RECENT_LOG_LIMIT)
+        stats = ChapterService.stats_from_counts(counts)
+        return self.build_processing_status(stats, recent_logs)
+    
+    @staticmethod
+    def build_processing_status(stats: Dict[str, int], recent_logs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the processing status from chapter stats and logs without touching the database."""
         # Determine overall status
         if stats['completed'] == stats['total_chapters'] and stats['total_chapters'] > 0:
             overall_status = 'completed'
@@ -299,7 +442,7 @@ class ProcessingService:
         return {
             'overall_status': overall_status,
             'chapter_stats': stats,
-            'recent_logs': logs[-10:] if logs else []  # Last 10 logs
+            'recent_logs': recent_logs
         }
 
 class AudiobookService:
@@ -309,7 +452,13 @@ class AudiobookService:
         self.book_service = BookService(repository_factory)
         self.chapter_service = ChapterService(repository_factory)
         self.page_service = PageService(repository_factory)
-        self.processing_service = ProcessingService(repository_factory)
+        self.processing_service = ProcessingService(
+            repository_factory, self.book_service, self.chapter_service, self.page_service
+        )
+        # Cached reads are keyed on the connection's data version, which moves when any write commits
+        self._db_connection = repository_factory.db_connection
+        self._info_cache = TTLCache(maxsize=512, ttl=30)
+        self._all_cache = TTLCache(maxsize=1, ttl=30)
     
     def create_audiobook(self, book_id: str, title: str, author: str = None, 
                         genre: str = None, year: str = None, page_count: int = None,
@@ -321,12 +470,28 @@ class AudiobookService:
         """Add extracted pages to a book."""
         return self.page_service.create_pages(book_id, pages)
     
+    def add_page_texts_to_book(self, book_id: str, texts: Sequence[str],
+                               page_numbers: Optional[Sequence[int]] = None) -> bool:
+        """Add extracted page texts to a book without building per-page dicts."""
+        return self.page_service.create_page_texts(book_id, texts, page_numbers)
+    
+    def add_pages_json_to_book(self, book_id: str, pages_json: str) -> Optional[int]:
+        """Add pages to a book straight from pages.json text; returns the page count, or None on failure."""
+        return self.page_service.create_pages_from_json(book_id, pages_json)
+    
     def add_chapters_to_book(self, book_id: str, chapters: List[Dict[str, Any]]) -> bool:
         """Add chapters to a book."""
         return self.chapter_service.create_chapters(book_id, chapters)
     
     def get_audiobook_info(self, book_id: str) -> Optional[Dict[str, Any]]:
         """Get complete audiobook information."""
+        # Write pending logs first so they move the data version
+        self.processing_service.log_buffer.flush()
+        key = (book_id, self._db_connection.data_version)
+        cached = self._info_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         book = self.book_service.get_book(book_id)
         if not book:
             return None
@@ -334,21 +499,41 @@ class AudiobookService:
         chapters = self.chapter_service.get_chapters(book_id)
         processing_status = self.processing_service.get_processing_status(book_id)
         
-        return {
+        info = {
             'book': book,
             'chapters': chapters,
             'processing_status': processing_status
         }
+        self._info_cache.set(key, info)
+        # Callers get their own copy so editing it cannot change the cached entry
+        return copy.deepcopy(info)
     
     def get_all_audiobooks(self) -> List[Dict[str, Any]]:
         """Get all audiobooks with their information."""
+        # Write pending logs first so they move the data version
+        self.processing_service.log_buffer.flush()
+        key = (None, self._db_connection.data_version)
+        cached = self._all_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         books = self.book_service.get_all_books()
-        result = []
+        book_ids = [book['book_id'] for book in books]
+        
+        # Load children for every book at once instead of querying per book
+        chapters_by_book = defaultdict(list)
+        for chapter in self.chapter_service.get_chapters_for_books(book_ids):
+            chapters_by_book[chapter['book_id']].append(chapter)
+        logs_by_book = defaultdict(list)
+        for log in self.processing_service.get_recent_logs_for_books(book_ids):
+            logs_by_book[log['book_id']].append(log)
         
+        result = []
         for book in books:
             book_id = book['book_id']
-            chapters = self.chapter_service.get_chapters(book_id)
-            processing_status = self.processing_service.get_processing_status(book_id)
+            chapters = chapters_by_book[book_id]
+            stats = ChapterService.compute_processing_stats(chapters)
+            processing_status = ProcessingService.build_processing_status(stats, logs_by_book[book_id])
             
             result.append({
                 'book': book,
@@ -356,7 +541,8 @@ class AudiobookService:
                 'processing_status': processing_status
             })
         
-        return result
+        self._all_cache.set(key, result)
+        return copy.deepcopy(result)
     
     def delete_audiobook(self, book_id: str) -> bool:
         """Delete an audiobook and all its data."""
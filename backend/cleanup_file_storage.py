@@ -4,7 +4,9 @@ This script removes all file-based storage dependencies after successful migrati
 """
 
 import os
+import errno
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
@@ -26,7 +28,17 @@ class FileStorageCleanup:
                 print("Creating final backup before cleanup...")
                 if self.backup_dir.exists():
                     shutil.rmtree(self.backup_dir)
-                shutil.copytree(self.data_dir, self.backup_dir)
+                try:
+                    # The directory is deleted anyway, so move it aside instead of copying
+                    self.data_dir.rename(self.backup_dir)
+                    print(f"Final backup created at: {self.backup_dir}")
+                    print(f"Removed directory: {self.data_dir}")
+                    return True
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    # Backup lives on another filesystem; fall back to a full copy
+                    shutil.copytree(self.data_dir, self.backup_dir)
                 print(f"Final backup created at: {self.backup_dir}")
             
             # Remove the books directory
@@ -62,21 +74,20 @@ class FileStorageCleanup:
     def cleanup_temp_files(self) -> bool:
         """Clean up any temporary files."""
         try:
-            # Clean up any .pyc files
-            for pyc_file in Path(".").rglob("*.pyc"):
-                try:
-                    pyc_file.unlink()
-                    print(f"Removed .pyc file: {pyc_file}")
-                except Exception as e:
-                    print(f"Error removing {pyc_file}: {e}")
-            
-            # Clean up __pycache__ directories
-            for pycache_dir in Path(".").rglob("__pycache__"):
-                try:
-                    shutil.rmtree(pycache_dir)
-                    print(f"Removed __pycache__: {pycache_dir}")
-                except Exception as e:
-                    print(f"Error removing {pycache_dir}: {e}")
+            # Collect .pyc files and __pycache__ directories in a single walk
+            pyc_files = []
+            pycache_dirs = []
+            for root, dirs, files in os.walk("."):
+                pyc_files.extend(Path(root) / f for f in files if f.endswith(".pyc"))
+                if "__pycache__" in dirs:
+                    # Removed wholesale below, so no need to descend into it
+                    dirs.remove("__pycache__")
+                    pycache_dirs.append(Path(root) / "__pycache__")
+            
+            # Deletions are I/O bound, so overlap them
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(self._remove_pyc_file, pyc_files))
+                list(executor.map(self._remove_pycache_dir, pycache_dirs))
             
             return True
             
@@ -84,6 +95,22 @@ class FileStorageCleanup:
             print(f"Error cleaning up temp files: {e}")
             return False
     
+    def _remove_pyc_file(self, pyc_file: Path):
+        """Remove a single .pyc file, reporting errors instead of raising."""
+        try:
+            pyc_file.unlink()
+            print(f"Removed .pyc file: {pyc_file}")
+        except Exception as e:
+            print(f"Error removing {pyc_file}: {e}")
+    
+    def _remove_pycache_dir(self, pycache_dir: Path):
+        """Remove a single __pycache__ directory, reporting errors instead of raising."""
+        try:
+            shutil.rmtree(pycache_dir)
+            print(f"Removed __pycache__: {pycache_dir}")
+        except Exception as e:
+            print(f"Error removing {pycache_dir}: {e}")
+    
     def verify_cleanup(self) -> bool:
         """Verify that cleanup was successful."""
         try:
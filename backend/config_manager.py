@@ -8,6 +8,24 @@ import base64
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dump_json(config: Dict[str, Any], sort_keys: bool = False) -> bytes:
+    """Serialize configuration as indented JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(config, option=option)
+    return json.dumps(config, indent=2, sort_keys=sort_keys).encode('utf-8')
+
+def _load_json(data: bytes) -> Dict[str, Any]:
+    """Parse configuration JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 class ConfigManager:
     """Manages application configuration and secure API key storage."""
     
@@ -15,6 +33,8 @@ class ConfigManager:
         self.config_dir = Path.home() / ".audiobook_generator"
         self.config_file = self.config_dir / "config.json"
         self._config_cache = None
+        self._api_key_cache: Optional[str] = None
+        self._last_written_hash: Optional[int] = None
         
     def ensure_config_dir(self):
         """Ensure the config directory exists."""
@@ -35,9 +55,9 @@ class ConfigManager:
             }
             
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
+            config = _load_json(self.config_file.read_bytes())
             self._config_cache = config
+            self._last_written_hash = self._config_hash(config)
             return config
         except Exception:
             return {
@@ -46,26 +66,42 @@ class ConfigManager:
                 'api_key': None
             }
             
+    @staticmethod
+    def _config_hash(config: Dict[str, Any]) -> int:
+        """Hash configuration content independently of key order."""
+        return hash(_dump_json(config, sort_keys=True))
+        
     def save_config(self, config: Dict[str, Any]):
-        """Save configuration to file."""
+        """Save configuration to file, skipping the write when nothing changed."""
+        config_hash = self._config_hash(config)
+        if config_hash == self._last_written_hash and self.config_file.exists():
+            self._config_cache = config
+            return
+            
         self.ensure_config_dir()
         
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Write to a temp file and rename over the real one so a crash never leaves it torn
+            tmp_file = self.config_file.with_suffix('.tmp')
+            tmp_file.write_bytes(_dump_json(config))
             
             # Set secure permissions
             try:
-                os.chmod(self.config_file, 0o600)
+                os.chmod(tmp_file, 0o600)
             except:
                 pass
-                
+            
+            os.replace(tmp_file, self.config_file)
             self._config_cache = config
+            self._last_written_hash = config_hash
         except Exception as e:
             raise Exception(f"Failed to save configuration: {str(e)}")
             
     def get_api_key(self) -> Optional[str]:
         """Get the stored API key."""
+        if self._api_key_cache is not None:
+            return self._api_key_cache
+            
         config = self.load_config()
         
         if not config.get('api_key'):
@@ -74,13 +110,15 @@ class ConfigManager:
         try:
             # Decode the stored key
             encoded_key = config['api_key']
-            return base64.b64decode(encoded_key).decode('utf-8')
+            self._api_key_cache = base64.b64decode(encoded_key).decode('utf-8')
+            return self._api_key_cache
         except Exception:
             return None
             
     def set_api_key(self, api_key: str):
         """Set and save the API key."""
         config = self.load_config()
+        self._api_key_cache = None
         
         if api_key:
             # Encode the key for basic obfuscation
@@ -91,6 +129,8 @@ class ConfigManager:
             
         config['setup_completed'] = True
         self.save_config(config)
+        # Keep the raw key so later reads skip the base64 decode
+        self._api_key_cache = api_key or None
         
     def is_setup_completed(self) -> bool:
         """Check if initial setup is completed."""
@@ -110,6 +150,9 @@ class ConfigManager:
         
     def has_api_key(self) -> bool:
         """Check if API key is available."""
+        if self._api_key_cache is not None:
+            return True
+        # A stored key only counts if it decodes
         return self.get_api_key() is not None
         
     def clear_config(self):
@@ -118,5 +161,7 @@ class ConfigManager:
             if self.config_file.exists():
                 self.config_file.unlink()
             self._config_cache = None
+            self._api_key_cache = None
+            self._last_written_hash = None
         except Exception:
             pass
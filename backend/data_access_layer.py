@@ -4,18 +4,281 @@ Handles all database operations with proper OOP patterns.
 This layer abstracts database operations from business logic.
 """
 
+import io
+import os
 import sqlite3
 import json
 import base64
+import queue
+import threading
+import time
+import zlib
+import atexit
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Tuple, BinaryIO
 from abc import ABC, abstractmethod
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Hot-path SQL is kept in constants so every call hands sqlite3 the same text
+# and hits its per-connection statement cache instead of re-preparing.
+
+# Audio lives in chapter_audio_chunks, split so each row fills one 4 KiB leaf page
+DB_PAGE_SIZE = 4096
+AUDIO_CHUNK_SIZE = 4000
+
+# Uncompressed PCM is stored compressed; already-compressed formats are stored as-is
+COMPRESSIBLE_AUDIO_FORMATS = frozenset({'audio/wav', 'audio/x-wav', 'audio/wave'})
+
+# Every book column except the cover BLOB, plus a presence flag
+BOOK_META_COLUMNS = '''
+    id, book_id, title, author, genre, year, page_count, cover_image_type,
+    created_at, updated_at, cover_image_data IS NOT NULL AS has_cover
+'''
+
+# Every chapter column except the audio BLOB, plus a cheap presence flag
+CHAPTER_META_COLUMNS = '''
+    id, book_id, chapter_index, title, start_page, end_page, summary_text,
+    audio_format, processing_status, created_at, updated_at,
+    EXISTS (SELECT 1 FROM chapter_audio_chunks WHERE chapter_id = chapters.id) AS has_audio
+'''
+
+SQL_CHAPTER_META_BY_BOOK = f'''
+    SELECT {CHAPTER_META_COLUMNS} FROM chapters 
+    WHERE book_id = ? 
+    ORDER BY chapter_index
+'''
+
+SQL_CHAPTER_META_BY_BOOKS = f'''
+    SELECT {CHAPTER_META_COLUMNS} FROM chapters 
+    WHERE book_id IN ({{placeholders}}) 
+    ORDER BY book_id, chapter_index
+'''
+
+SQL_CHAPTER_AUDIO_REF = '''
+    SELECT id, audio_format, audio_codec FROM chapters 
+    WHERE book_id = ? AND chapter_index = ? 
+    LIMIT 1
+'''
+
+SQL_CHAPTER_AUDIO_CHUNKS = '''
+    SELECT data FROM chapter_audio_chunks 
+    WHERE chapter_id = ? 
+    ORDER BY seq
+'''
+
+SQL_CHAPTER_STATUS_COUNTS = '''
+    SELECT processing_status, COUNT(*) AS count FROM chapters 
+    WHERE book_id = ? 
+    GROUP BY processing_status
+'''
+
+SQL_PAGE_TEXT_RANGE = '''
+    SELECT text_content FROM pages 
+    WHERE book_id = ? AND page_number BETWEEN ? AND ? 
+    ORDER BY page_number
+'''
+
+SQL_INSERT_LOG = '''
+    INSERT INTO processing_logs (book_id, stage, status, message)
+    VALUES (?, ?, ?, ?)
+'''
+
+SQL_RECENT_LOGS = '''
+    SELECT * FROM processing_logs 
+    WHERE book_id = ? 
+    ORDER BY created_at DESC, id DESC 
+    LIMIT ?
+'''
+
+def _audio_codec_for(audio_format: Optional[str]) -> Optional[str]:
+    """Storage codec for audio of the given format: zstd when available, else zlib, or None to store raw."""
+    if audio_format not in COMPRESSIBLE_AUDIO_FORMATS:
+        return None
+    return 'zstd' if zstandard is not None else 'zlib'
+
+def _encode_audio(pieces: Iterator[bytes], codec: Optional[str]) -> Iterator[bytes]:
+    """Compress a byte stream with ``codec`` and re-cut it into AUDIO_CHUNK_SIZE pieces."""
+    if codec is None:
+        yield from pieces
+        return
+    compressor = zstandard.ZstdCompressor(level=3).compressobj() if codec == 'zstd' else zlib.compressobj(1)
+    pending = bytearray()
+    for piece in pieces:
+        pending += compressor.compress(piece)
+        while len(pending) >= AUDIO_CHUNK_SIZE:
+            yield bytes(pending[:AUDIO_CHUNK_SIZE])
+            del pending[:AUDIO_CHUNK_SIZE]
+    pending += compressor.flush()
+    for start in range(0, len(pending), AUDIO_CHUNK_SIZE):
+        yield bytes(pending[start:start + AUDIO_CHUNK_SIZE])
+
+def _decode_audio(chunks: Iterator[bytes], codec: Optional[str]) -> Iterator[bytes]:
+    """Undo _encode_audio, yielding the original bytes piece by piece."""
+    if codec is None:
+        yield from chunks
+        return
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Audio is zstd-compressed but the zstandard package is not installed")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj()
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    if codec == 'zlib':
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, columns: Tuple[str, ...], conflict_columns: Tuple[str, ...] = (),
+                update_columns: Tuple[str, ...] = (), touch_updated_at: bool = False) -> str:
+    """Build (once) the INSERT statement for a table and column list.
+    
+    With ``conflict_columns`` it becomes an UPSERT that updates ``update_columns`` in place
+    (unlike INSERT OR REPLACE, the existing row and its id are kept).
+    """
+    placeholders = ', '.join('?' for _ in columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    if conflict_columns:
+        assignments = [f"{column} = excluded.{column}" for column in update_columns]
+        if touch_updated_at:
+            assignments.append('updated_at = CURRENT_TIMESTAMP')
+        sql += f" ON CONFLICT({', '.join(conflict_columns)}) DO UPDATE SET {', '.join(assignments)}"
+    return sql
+
+def _open_connection(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """Open a SQLite connection with Row results, optionally read-only."""
+    if read_only:
+        uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+@lru_cache(maxsize=128)
+def _in_sql(sql: str, count: int) -> str:
+    """Expand ``{placeholders}`` in ``sql`` to ``count`` parameter markers (cached per size)."""
+    return sql.format(placeholders=', '.join('?' * count))
+
+@lru_cache(maxsize=128)
+def _update_sql(table: str, columns: Tuple[str, ...], key_column: str, touch_updated_at: bool = False) -> str:
+    """Build (once) the UPDATE statement for a table and sorted column set."""
+    assignments = [f"{column} = ?" for column in columns]
+    if touch_updated_at:
+        assignments.append('updated_at = CURRENT_TIMESTAMP')
+    return f"UPDATE {table} SET {', '.join(assignments)} WHERE {key_column} = ?"
+
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections."""
+    
+    def __init__(self, db_path: str, min_size: int = 2, max_size: int = 8,
+                 setup: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 read_only: bool = False):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.read_only = read_only
+        self._setup = setup
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(min_size):
+            self._idle.put(self._open())
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a new physical connection and apply the setup hook once."""
+        conn = _open_connection(self.db_path, self.read_only)
+        if self._setup:
+            self._setup(conn)
+        self._all.append(conn)
+        return conn
+    
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while below max_size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.max_size:
+                return self._open()
+        return self._idle.get(timeout=timeout)
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding any unfinished transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager that borrows a connection for the duration of the block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    def close_all(self):
+        """Close every connection owned by the pool."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+class _SavepointConnection:
+    """The write connection as handed out by writer() inside DatabaseConnection.transaction().
+    
+    Each writer block runs in its own savepoint: commit() releases it and rollback() undoes
+    only that block, so the enclosing transaction still commits once, at its end.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._open = True
+        conn.execute('SAVEPOINT writer_block')
+    
+    def commit(self):
+        if self._open:
+            self._conn.execute('RELEASE writer_block')
+            self._open = False
+    
+    def rollback(self):
+        if self._open:
+            self._conn.execute('ROLLBACK TO writer_block')
+            self._conn.execute('RELEASE writer_block')
+            self._open = False
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
 
 class DatabaseConnection:
-    """Singleton database connection manager."""
+    """Singleton database connection manager.
+    
+    Writes go through one dedicated connection serialized by a lock; reads borrow
+    from a pool of read-only connections so they run in parallel under WAL.
+    Connections are reopened in a forked child instead of sharing the parent's.
+    """
     _instance = None
-    _connection = None
+    _pool = None
+    _write_conn = None
+    # Connections inherited across fork(); kept referenced so they are never closed
+    # (closing them in the child would drop the parent's file locks)
+    _inherited: List[Any] = []
+    # Outermost write blocks ended in this process (part of data_version)
+    _commit_count = 0
+    _version_conn = None
     
     def __new__(cls, db_path="data/audiobooks.db"):
         if cls._instance is None:
@@ -23,15 +286,58 @@ class DatabaseConnection:
         return cls._instance
     
     def __init__(self, db_path="data/audiobooks.db"):
-        if self._connection is None:
+        if self._write_conn is None:
             self.db_path = db_path
-            self._connection = sqlite3.connect(db_path, check_same_thread=False)
-            self._connection.row_factory = sqlite3.Row
-            self._init_database()
+            self._open()
+    
+    def _open(self):
+        """Open the write connection and reader pool for the current process."""
+        self._pid = os.getpid()
+        # Re-entrant so writes made inside transaction() can take the writer again
+        self._write_lock = threading.RLock()
+        self._in_transaction = False
+        self._write_conn = _open_connection(self.db_path)
+        self._configure_connection(self._write_conn)
+        self._init_database()
+        # In-memory databases are per-connection, so readers share the write connection instead
+        self._pool = None
+        self._version_conn = None
+        self._version_lock = threading.Lock()
+        if self.db_path != ':memory:':
+            self._pool = ConnectionPool(self.db_path, min_size=2, max_size=8, setup=self._configure_connection,
+                                        read_only=True)
+            # Its PRAGMA data_version moves whenever any other connection, in any process, commits
+            self._version_conn = _open_connection(self.db_path, read_only=True)
+    
+    def _ensure_process(self):
+        """Reopen connections if this process was forked after they were opened."""
+        if self._pid != os.getpid():
+            self._inherited.append((self._pool, self._write_conn, self._version_conn))
+            self._open()
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection PRAGMAs."""
+        # Only takes effect when the database file is first created
+        conn.execute(f'PRAGMA page_size={DB_PAGE_SIZE}')
+        if self.db_path != ':memory:':
+            # WAL lets readers run alongside the background processing writers
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            # Audio BLOB writes can balloon the WAL; truncate it back after each checkpoint
+            conn.execute('PRAGMA journal_size_limit=67108864')  # 64 MiB
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MiB page cache
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB; serves cover/audio BLOB reads without a copy
     
     def _init_database(self):
         """Initialize database schema."""
-        cursor = self._connection.cursor()
+        with self.writer() as conn:
+            self._create_schema(conn)
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Create tables if they do not exist."""
+        cursor = conn.cursor()
         
         # Books table - stores book metadata
         cursor.execute('''
@@ -60,8 +366,9 @@ class DatabaseConnection:
                 start_page INTEGER NOT NULL,
                 end_page INTEGER NOT NULL,
                 summary_text TEXT,  -- Store summary directly in DB
-                audio_data BLOB,    -- Store audio as BLOB
+                audio_data BLOB,    -- Legacy inline audio; moved to chapter_audio_chunks
                 audio_format TEXT,  -- audio/wav, audio/mp3, etc.
+                audio_codec TEXT,   -- storage compression of the audio chunks (zstd, zlib) or NULL
                 processing_status TEXT DEFAULT 'pending',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -70,6 +377,17 @@ class DatabaseConnection:
             )
         ''')
         
+        # Chapter audio, split into page-sized chunks to keep BLOBs out of the chapters b-tree
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chapter_audio_chunks (
+                chapter_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (chapter_id, seq),
+                FOREIGN KEY (chapter_id) REFERENCES chapters (id)
+            )
+        ''')
+        
         # Pages table - stores page content
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS pages (
@@ -96,23 +414,206 @@ class DatabaseConnection:
             )
         ''')
         
-        self._connection.commit()
+        # Per-chapter lookups use the UNIQUE(book_id, chapter_index) index; this copy was redundant
+        cursor.execute('DROP INDEX IF EXISTS idx_chapters_book_idx')
+        
+        # Covering index so chapter text range scans never touch the pages table
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pages_book_page_text ON pages(book_id, page_number, text_content)
+        ''')
+        
+        # Covering index for per-book status counts
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_chapters_book_status ON chapters(book_id, processing_status)
+        ''')
+        
+        # Index for recent-log lookups
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_logs_book_created ON processing_logs(book_id, created_at)
+        ''')
+        
+        # Columns added after the initial schema
+        self._ensure_column(conn, 'chapters', 'audio_codec', 'TEXT')
+        
+        self._create_book_stats(conn)
+        
+        conn.commit()
+        self._migrate_inline_audio(conn)
     
-    def get_connection(self):
-        """Get database connection."""
-        return self._connection
+    def _create_book_stats(self, conn: sqlite3.Connection):
+        """Per-book chapter counts kept current by triggers on chapters, so listing books needs no aggregation."""
+        cursor = conn.cursor()
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'book_stats'"
+        ).fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS book_stats (
+                book_id TEXT PRIMARY KEY,
+                chapter_count INTEGER NOT NULL DEFAULT 0,
+                completed_chapters INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_book_stats_chapter_insert AFTER INSERT ON chapters
+            BEGIN
+                INSERT INTO book_stats (book_id, chapter_count, completed_chapters)
+                VALUES (NEW.book_id, 1, NEW.processing_status = 'completed')
+                ON CONFLICT(book_id) DO UPDATE SET
+                    chapter_count = chapter_count + 1,
+                    completed_chapters = completed_chapters + excluded.completed_chapters;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_book_stats_chapter_delete AFTER DELETE ON chapters
+            BEGIN
+                UPDATE book_stats SET
+                    chapter_count = chapter_count - 1,
+                    completed_chapters = completed_chapters - (OLD.processing_status = 'completed')
+                WHERE book_id = OLD.book_id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_book_stats_chapter_update
+            AFTER UPDATE OF book_id, processing_status ON chapters
+            BEGIN
+                UPDATE book_stats SET
+                    chapter_count = chapter_count - 1,
+                    completed_chapters = completed_chapters - (OLD.processing_status = 'completed')
+                WHERE book_id = OLD.book_id;
+                INSERT INTO book_stats (book_id, chapter_count, completed_chapters)
+                VALUES (NEW.book_id, 1, NEW.processing_status = 'completed')
+                ON CONFLICT(book_id) DO UPDATE SET
+                    chapter_count = chapter_count + 1,
+                    completed_chapters = completed_chapters + excluded.completed_chapters;
+            END
+        ''')
+        if not exists:
+            # Backfill from chapters written before the table existed
+            cursor.execute('''
+                INSERT INTO book_stats (book_id, chapter_count, completed_chapters)
+                SELECT book_id, COUNT(*), SUM(processing_status = 'completed') FROM chapters GROUP BY book_id
+            ''')
+        conn.commit()
+    
+    @staticmethod
+    def _ensure_column(conn: sqlite3.Connection, table: str, column: str, declaration: str):
+        """Add a column to an existing table if it is missing."""
+        columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        if column not in columns:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+    
+    def _migrate_inline_audio(self, conn: sqlite3.Connection):
+        """Move audio stored inline in chapters.audio_data into chapter_audio_chunks."""
+        cursor = conn.cursor()
+        cursor.execute('SELECT id FROM chapters WHERE audio_data IS NOT NULL')
+        for (chapter_id,) in cursor.fetchall():
+            audio_data = cursor.execute('SELECT audio_data FROM chapters WHERE id = ?', (chapter_id,)).fetchone()[0]
+            ChapterRepository._write_audio_chunks(cursor, chapter_id, io.BytesIO(audio_data))
+            cursor.execute('UPDATE chapters SET audio_data = NULL WHERE id = ?', (chapter_id,))
+            conn.commit()
+    
+    def reader(self):
+        """Borrow a pooled read-only connection (use as a context manager)."""
+        self._ensure_process()
+        if self._pool is None:
+            return self._shared_reader()
+        return self._pool.connection()
+    
+    @contextmanager
+    def _shared_reader(self) -> Iterator[sqlite3.Connection]:
+        """Read through the write connection, holding its lock, when there is no reader pool."""
+        with self._write_lock:
+            yield self._write_conn
+    
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write connection exclusively for the duration of the block."""
+        self._ensure_process()
+        with self._write_lock:
+            if self._in_transaction:
+                block = _SavepointConnection(self._write_conn)
+                try:
+                    yield block
+                finally:
+                    block.rollback()  # no-op once the block committed
+                return
+            try:
+                yield self._write_conn
+            finally:
+                if self._write_conn.in_transaction:
+                    self._write_conn.rollback()
+                self._commit_count += 1
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run every write made on this thread inside the block as one transaction.
+        
+        Repository writes keep their own commit/rollback logic (each becomes a savepoint), but
+        only the end of the block commits; an exception escaping it rolls everything back.
+        Readers do not see the writes until then.
+        """
+        self._ensure_process()
+        with self._write_lock:
+            if self._in_transaction:
+                yield
+                return
+            conn = self._write_conn
+            conn.execute('BEGIN IMMEDIATE')
+            self._in_transaction = True
+            try:
+                yield
+                conn.commit()
+            finally:
+                self._in_transaction = False
+                if conn.in_transaction:
+                    conn.rollback()
+                self._commit_count += 1
+    
+    @property
+    def data_version(self) -> Tuple[int, int]:
+        """Value that changes whenever a write commits, from this process or any other.
+        
+        Combines the count of this process's write blocks with SQLite's PRAGMA data_version,
+        so caches keyed on it also drop reads made stale by worker processes and CLI tools.
+        """
+        self._ensure_process()
+        if self._version_conn is None:
+            return self._commit_count, 0
+        with self._version_lock:
+            return self._commit_count, self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a transaction() block is open."""
+        return self._in_transaction
     
     def close(self):
-        """Close database connection."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Close the write connection and all pooled readers."""
+        if self._pool:
+            self._pool.close_all()
+            self._pool = None
+        if self._version_conn:
+            with self._version_lock:
+                self._version_conn.close()
+            self._version_conn = None
+        if self._write_conn:
+            with self._write_lock:
+                self._write_conn.close()
+            self._write_conn = None
 
 class BaseRepository(ABC):
     """Abstract base class for repositories."""
     
     def __init__(self, db_connection: DatabaseConnection):
-        self.db = db_connection.get_connection()
+        self.db_connection = db_connection
+    
+    def _reader(self):
+        """Borrow a read-only connection for a single query."""
+        return self.db_connection.reader()
+    
+    def _writer(self):
+        """Take the write connection for a single modifying operation."""
+        return self.db_connection.writer()
     
     @abstractmethod
     def create(self, entity: Dict[str, Any]) -> int:
@@ -133,263 +634,627 @@ class BaseRepository(ABC):
     def delete(self, entity_id: Any) -> bool:
         """Delete entity."""
         pass
+    
+    def _insert_many(self, table: str, columns: List[str], rows: List[Dict[str, Any]]) -> int:
+        """Insert many rows with a single prepared statement in one transaction."""
+        return self._insert_many_tuples(table, columns, [tuple(row.get(c) for c in columns) for row in rows])
+    
+    def _insert_many_tuples(self, table: str, columns: List[str], rows: Iterable[Tuple],
+                            conflict_columns: Tuple[str, ...] = (), update_columns: Tuple[str, ...] = (),
+                            touch_updated_at: bool = False) -> int:
+        """Insert many positional rows (ordered as ``columns``) in one transaction, optionally as an UPSERT.
+        
+        ``rows`` may be any iterable (e.g. a ``zip`` over column lists); it is consumed once.
+        """
+        if isinstance(rows, (list, tuple)) and not rows:
+            return 0
+        sql = _insert_sql(table, tuple(columns), conflict_columns, update_columns, touch_updated_at)
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany(sql, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return cursor.rowcount
+    
+    def _select_in(self, sql: str, values: List[Any], chunk_size: int = 512) -> List[Dict[str, Any]]:
+        """Run a query containing an ``IN ({placeholders})`` clause, chunking large value lists.
+        
+        Each chunk is padded (by repeating its last value) to a power-of-two length, so only a
+        handful of distinct statements ever reach sqlite3's statement cache.
+        """
+        results = []
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(values), chunk_size):
+                chunk = values[start:start + chunk_size]
+                bucket = min(1 << (len(chunk) - 1).bit_length(), chunk_size)
+                chunk = chunk + chunk[-1:] * (bucket - len(chunk))
+                cursor.execute(_in_sql(sql, bucket), chunk)
+                results.extend(dict(row) for row in cursor.fetchall())
+            return results
 
 class BookRepository(BaseRepository):
     """Repository for book operations."""
     
     def create(self, book_data: Dict[str, Any]) -> int:
         """Create a new book."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            INSERT INTO books (book_id, title, author, genre, year, page_count, cover_image_data, cover_image_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            book_data['book_id'],
-            book_data['title'],
-            book_data.get('author'),
-            book_data.get('genre'),
-            book_data.get('year'),
-            book_data.get('page_count'),
-            book_data.get('cover_image_data'),
-            book_data.get('cover_image_type')
-        ))
-        self.db.commit()
-        return cursor.lastrowid
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO books (book_id, title, author, genre, year, page_count, cover_image_data, cover_image_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                book_data['book_id'],
+                book_data['title'],
+                book_data.get('author'),
+                book_data.get('genre'),
+                book_data.get('year'),
+                book_data.get('page_count'),
+                book_data.get('cover_image_data'),
+                book_data.get('cover_image_type')
+            ))
+            conn.commit()
+            return cursor.lastrowid
     
     def get_by_id(self, book_id: str) -> Optional[Dict[str, Any]]:
-        """Get book by ID."""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM books WHERE book_id = ?', (book_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        """Get book by ID (metadata only; use get_cover for the image)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT {BOOK_META_COLUMNS} FROM books WHERE book_id = ?', (book_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def get_cover(self, book_id: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """Get cover image data and MIME type for a book."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT cover_image_data, cover_image_type FROM books WHERE book_id = ?', (book_id,))
+            row = cursor.fetchone()
+            return (row['cover_image_data'], row['cover_image_type']) if row else (None, None)
     
     def get_all(self) -> List[Dict[str, Any]]:
-        """Get all books."""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM books ORDER BY created_at DESC')
-        return [dict(row) for row in cursor.fetchall()]
+        """Get all books (metadata only)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT {BOOK_META_COLUMNS} FROM books ORDER BY created_at DESC')
+            return [dict(row) for row in cursor.fetchall()]
     
     def update(self, book_id: str, updates: Dict[str, Any]) -> bool:
         """Update book."""
-        cursor = self.db.cursor()
-        set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
-        values = list(updates.values()) + [book_id]
-        cursor.execute(f'UPDATE books SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE book_id = ?', values)
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            columns = tuple(sorted(updates))
+            values = [updates[c] for c in columns] + [book_id]
+            cursor.execute(_update_sql('books', columns, 'book_id', True), values)
+            conn.commit()
+            return cursor.rowcount > 0
     
     def delete(self, book_id: str) -> bool:
         """Delete book and all related data."""
-        cursor = self.db.cursor()
-        # Delete in order to respect foreign key constraints
-        cursor.execute('DELETE FROM pages WHERE book_id = ?', (book_id,))
-        cursor.execute('DELETE FROM chapters WHERE book_id = ?', (book_id,))
-        cursor.execute('DELETE FROM processing_logs WHERE book_id = ?', (book_id,))
-        cursor.execute('DELETE FROM books WHERE book_id = ?', (book_id,))
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            # Delete in order to respect foreign key constraints
+            cursor.execute('DELETE FROM pages WHERE book_id = ?', (book_id,))
+            cursor.execute('''
+                DELETE FROM chapter_audio_chunks 
+                WHERE chapter_id IN (SELECT id FROM chapters WHERE book_id = ?)
+            ''', (book_id,))
+            cursor.execute('DELETE FROM chapters WHERE book_id = ?', (book_id,))
+            cursor.execute('DELETE FROM book_stats WHERE book_id = ?', (book_id,))
+            cursor.execute('DELETE FROM processing_logs WHERE book_id = ?', (book_id,))
+            cursor.execute('DELETE FROM books WHERE book_id = ?', (book_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+    
+    def write_cover_from_file(self, book_id: str, file_path: str, cover_type: Optional[str] = None,
+                              chunk_size: int = 65536) -> bool:
+        """Stream a cover image file into the cover BLOB without loading it into memory at once."""
+        with open(file_path, 'rb') as f:
+            return self.write_cover_stream(book_id, f, os.path.getsize(file_path), cover_type, chunk_size)
+    
+    def write_cover_stream(self, book_id: str, stream: BinaryIO, size: int, cover_type: Optional[str] = None,
+                           chunk_size: int = 65536) -> bool:
+        """Stream ``size`` bytes from an open binary file into the cover BLOB."""
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    UPDATE books 
+                    SET cover_image_data = zeroblob(?), cover_image_type = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE book_id = ?
+                ''', (size, cover_type, book_id))
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return False
+                row = cursor.execute('SELECT id FROM books WHERE book_id = ?', (book_id,)).fetchone()
+                if hasattr(conn, 'blobopen'):
+                    # Incremental BLOB I/O (Python 3.11+)
+                    with conn.blobopen('books', 'cover_image_data', row['id']) as blob:
+                        for chunk in iter(lambda: stream.read(chunk_size), b''):
+                            blob.write(chunk)
+                else:
+                    cursor.execute('UPDATE books SET cover_image_data = ? WHERE id = ?', (stream.read(size), row['id']))
+                conn.commit()
+                return True
+            except Exception:
+                conn.rollback()
+                raise
     
     def get_with_stats(self) -> List[Dict[str, Any]]:
         """Get books with processing statistics."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            SELECT b.*, 
-                   COUNT(c.id) as chapter_count,
-                   COUNT(CASE WHEN c.processing_status = 'completed' THEN 1 END) as completed_chapters
-            FROM books b
-            LEFT JOIN chapters c ON b.book_id = c.book_id
-            GROUP BY b.book_id
-            ORDER BY b.created_at DESC
-        ''')
-        return [dict(row) for row in cursor.fetchall()]
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT b.id, b.book_id, b.title, b.author, b.genre, b.year, b.page_count,
+                       b.cover_image_type, b.created_at, b.updated_at,
+                       b.cover_image_data IS NOT NULL as has_cover,
+                       COALESCE(s.chapter_count, 0) as chapter_count,
+                       COALESCE(s.completed_chapters, 0) as completed_chapters
+                FROM books b
+                LEFT JOIN book_stats s ON s.book_id = b.book_id
+                ORDER BY b.created_at DESC
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
 
 class ChapterRepository(BaseRepository):
     """Repository for chapter operations."""
     
+    @staticmethod
+    def _write_audio_chunks(cursor: sqlite3.Cursor, chapter_id: int, stream: BinaryIO,
+                            codec: Optional[str] = None):
+        """Replace a chapter's audio chunks with the contents of a binary stream, compressed with ``codec``."""
+        cursor.execute('DELETE FROM chapter_audio_chunks WHERE chapter_id = ?', (chapter_id,))
+        chunks = _encode_audio(iter(lambda: stream.read(AUDIO_CHUNK_SIZE), b''), codec)
+        cursor.executemany(
+            'INSERT INTO chapter_audio_chunks (chapter_id, seq, data) VALUES (?, ?, ?)',
+            ((chapter_id, seq, chunk) for seq, chunk in enumerate(chunks))
+        )
+    
     def create(self, chapter_data: Dict[str, Any]) -> int:
         """Create a new chapter."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            INSERT INTO chapters (book_id, chapter_index, title, start_page, end_page, summary_text, audio_data, audio_format)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            chapter_data['book_id'],
-            chapter_data['chapter_index'],
-            chapter_data['title'],
-            chapter_data['start_page'],
-            chapter_data['end_page'],
-            chapter_data.get('summary_text'),
-            chapter_data.get('audio_data'),
-            chapter_data.get('audio_format')
-        ))
-        self.db.commit()
-        return cursor.lastrowid
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO chapters (book_id, chapter_index, title, start_page, end_page, summary_text, audio_format)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                chapter_data['book_id'],
+                chapter_data['chapter_index'],
+                chapter_data['title'],
+                chapter_data['start_page'],
+                chapter_data['end_page'],
+                chapter_data.get('summary_text'),
+                chapter_data.get('audio_format')
+            ))
+            chapter_id = cursor.lastrowid
+            if chapter_data.get('audio_data'):
+                codec = _audio_codec_for(chapter_data.get('audio_format'))
+                self._write_audio_chunks(cursor, chapter_id, io.BytesIO(chapter_data['audio_data']), codec)
+                cursor.execute('UPDATE chapters SET audio_codec = ? WHERE id = ?', (codec, chapter_id))
+            conn.commit()
+            return chapter_id
+    
+    def create_many(self, chapters: List[Dict[str, Any]]) -> int:
+        """Create many chapters in a single transaction (audio is added separately)."""
+        return self._insert_many('chapters', [
+            'book_id', 'chapter_index', 'title', 'start_page', 'end_page',
+            'summary_text', 'audio_format'
+        ], chapters)
+    
+    def create_many_tuples(self, rows: List[Tuple[str, int, str, int, int]]) -> int:
+        """Create or refresh chapters from (book_id, chapter_index, title, start_page, end_page) tuples.
+        
+        Existing chapters keep their id, summary, audio and status; only the layout columns change.
+        """
+        return self._insert_many_tuples('chapters', [
+            'book_id', 'chapter_index', 'title', 'start_page', 'end_page'
+        ], rows, conflict_columns=('book_id', 'chapter_index'),
+           update_columns=('title', 'start_page', 'end_page'), touch_updated_at=True)
     
     def get_by_id(self, chapter_id: int) -> Optional[Dict[str, Any]]:
         """Get chapter by ID."""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM chapters WHERE id = ?', (chapter_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM chapters WHERE id = ?', (chapter_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     def get_by_book(self, book_id: str) -> List[Dict[str, Any]]:
         """Get all chapters for a book."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            SELECT * FROM chapters 
-            WHERE book_id = ? 
-            ORDER BY chapter_index
-        ''', (book_id,))
-        return [dict(row) for row in cursor.fetchall()]
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM chapters 
+                WHERE book_id = ? 
+                ORDER BY chapter_index
+            ''', (book_id,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_one_audio(self, book_id: str, chapter_index: int) -> Tuple[Optional[bytes], Optional[str]]:
+        """Get audio data and format for a single chapter."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            row = cursor.execute(SQL_CHAPTER_AUDIO_REF, (book_id, chapter_index)).fetchone()
+            if not row:
+                return None, None
+            cursor.execute(SQL_CHAPTER_AUDIO_CHUNKS, (row['id'],))
+            audio_data = b''.join(_decode_audio((chunk['data'] for chunk in cursor), row['audio_codec']))
+            return audio_data or None, row['audio_format']
+    
+    def read_audio_into(self, book_id: str, chapter_index: int, out: BinaryIO) -> Optional[str]:
+        """Copy a chapter's audio into a binary file chunk by chunk; returns its format, or None if absent."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            row = cursor.execute(SQL_CHAPTER_AUDIO_REF, (book_id, chapter_index)).fetchone()
+            if not row:
+                return None
+            written = 0
+            chunks = (chunk['data'] for chunk in cursor.execute(SQL_CHAPTER_AUDIO_CHUNKS, (row['id'],)))
+            for data in _decode_audio(chunks, row['audio_codec']):
+                written += out.write(data)
+            return row['audio_format'] if written else None
+    
+    def count_by_status(self, book_id: str) -> Dict[str, int]:
+        """Count a book's chapters grouped by processing status."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_CHAPTER_STATUS_COUNTS, (book_id,))
+            return {row['processing_status']: row['count'] for row in cursor.fetchall()}
+    
+    def list_meta(self, book_id: str) -> List[Dict[str, Any]]:
+        """Get all chapters for a book without the audio BLOB."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_CHAPTER_META_BY_BOOK, (book_id,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def list_meta_for_books(self, book_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get chapters for several books in one query, without the audio BLOB."""
+        return self._select_in(SQL_CHAPTER_META_BY_BOOKS, list(book_ids))
     
     def update(self, chapter_id: int, updates: Dict[str, Any]) -> bool:
         """Update chapter."""
-        cursor = self.db.cursor()
-        set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
-        values = list(updates.values()) + [chapter_id]
-        cursor.execute(f'UPDATE chapters SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = ?', values)
-        self.db.commit()
-        return cursor.rowcount > 0
+        updates = dict(updates)
+        audio_data = updates.pop('audio_data', None)
+        if audio_data is not None:
+            # Raw bytes written through the generic path are stored uncompressed
+            updates['audio_codec'] = None
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            columns = tuple(sorted(updates))
+            values = [updates[c] for c in columns] + [chapter_id]
+            cursor.execute(_update_sql('chapters', columns, 'id', True), values)
+            updated = cursor.rowcount > 0
+            if updated and audio_data is not None:
+                self._write_audio_chunks(cursor, chapter_id, io.BytesIO(audio_data))
+            conn.commit()
+            return updated
     
     def delete(self, chapter_id: int) -> bool:
         """Delete chapter."""
-        cursor = self.db.cursor()
-        cursor.execute('DELETE FROM chapters WHERE id = ?', (chapter_id,))
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM chapter_audio_chunks WHERE chapter_id = ?', (chapter_id,))
+            cursor.execute('DELETE FROM chapters WHERE id = ?', (chapter_id,))
+            conn.commit()
+            return cursor.rowcount > 0
     
     def update_summary(self, book_id: str, chapter_index: int, summary_text: str) -> bool:
         """Update chapter summary."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            UPDATE chapters 
-            SET summary_text = ?, processing_status = 'summarized', updated_at = CURRENT_TIMESTAMP
-            WHERE book_id = ? AND chapter_index = ?
-        ''', (summary_text, book_id, chapter_index))
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE chapters 
+                SET summary_text = ?, processing_status = 'summarized', updated_at = CURRENT_TIMESTAMP
+                WHERE book_id = ? AND chapter_index = ?
+            ''', (summary_text, book_id, chapter_index))
+            conn.commit()
+            return cursor.rowcount > 0
+    
+    def update_summaries_many(self, book_id: str, summaries: Dict[int, str]) -> int:
+        """Update many chapter summaries of a book in a single transaction."""
+        if not summaries:
+            return 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.executemany('''
+                    UPDATE chapters 
+                    SET summary_text = ?, processing_status = 'summarized', updated_at = CURRENT_TIMESTAMP
+                    WHERE book_id = ? AND chapter_index = ?
+                ''', [(text, book_id, index) for index, text in summaries.items()])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return cursor.rowcount
     
     def update_audio(self, book_id: str, chapter_index: int, audio_data: bytes, audio_format: str = 'audio/wav') -> bool:
         """Update chapter audio."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            UPDATE chapters 
-            SET audio_data = ?, audio_format = ?, processing_status = 'completed', updated_at = CURRENT_TIMESTAMP
-            WHERE book_id = ? AND chapter_index = ?
-        ''', (audio_data, audio_format, book_id, chapter_index))
-        self.db.commit()
-        return cursor.rowcount > 0
+        return self.write_audio_stream(book_id, chapter_index, io.BytesIO(audio_data), audio_format)
+    
+    def write_audio_stream(self, book_id: str, chapter_index: int, stream: BinaryIO,
+                           audio_format: str = 'audio/wav') -> bool:
+        """Stream an open binary file into a chapter's audio chunks (PCM formats are compressed)."""
+        codec = _audio_codec_for(audio_format)
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    UPDATE chapters 
+                    SET audio_format = ?, audio_codec = ?, processing_status = 'completed', updated_at = CURRENT_TIMESTAMP
+                    WHERE book_id = ? AND chapter_index = ?
+                ''', (audio_format, codec, book_id, chapter_index))
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return False
+                row = cursor.execute(
+                    'SELECT id FROM chapters WHERE book_id = ? AND chapter_index = ?', (book_id, chapter_index)
+                ).fetchone()
+                self._write_audio_chunks(cursor, row['id'], stream, codec)
+                conn.commit()
+                return True
+            except Exception:
+                conn.rollback()
+                raise
 
 class PageRepository(BaseRepository):
     """Repository for page operations."""
     
     def create(self, page_data: Dict[str, Any]) -> int:
         """Create a new page."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            INSERT INTO pages (book_id, page_number, text_content)
-            VALUES (?, ?, ?)
-        ''', (
-            page_data['book_id'],
-            page_data['page_number'],
-            page_data['text_content']
-        ))
-        self.db.commit()
-        return cursor.lastrowid
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO pages (book_id, page_number, text_content)
+                VALUES (?, ?, ?)
+            ''', (
+                page_data['book_id'],
+                page_data['page_number'],
+                page_data['text_content']
+            ))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def create_many(self, pages: List[Dict[str, Any]]) -> int:
+        """Create many pages in a single transaction."""
+        return self._insert_many('pages', ['book_id', 'page_number', 'text_content'], pages)
+    
+    def create_many_tuples(self, rows: Iterable[Tuple[str, int, str]]) -> int:
+        """Create or refresh pages from (book_id, page_number, text_content) tuples."""
+        return self._insert_many_tuples('pages', ['book_id', 'page_number', 'text_content'], rows,
+                                        conflict_columns=('book_id', 'page_number'),
+                                        update_columns=('text_content',))
+    
+    def create_many_from_json(self, book_id: str, pages_json: str) -> int:
+        """Create or refresh pages from a JSON array of ``{"page_number", "text"}`` objects.
+        
+        The array is bound once and unpacked by SQLite's ``json_each``, so no per-page Python
+        objects are built. Returns the number of pages written.
+        """
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            try:
+                # WHERE true keeps the ON CONFLICT clause from parsing as a join constraint
+                cursor.execute('''
+                    INSERT INTO pages (book_id, page_number, text_content)
+                    SELECT ?, COALESCE(json_extract(value, '$.page_number'), 1),
+                           COALESCE(json_extract(value, '$.text'), '')
+                    FROM json_each(?) WHERE true
+                    ON CONFLICT(book_id, page_number) DO UPDATE SET text_content = excluded.text_content
+                ''', (book_id, pages_json))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return cursor.rowcount
     
     def get_by_id(self, page_id: int) -> Optional[Dict[str, Any]]:
         """Get page by ID."""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM pages WHERE id = ?', (page_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM pages WHERE id = ?', (page_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
-    def get_by_book(self, book_id: str) -> List[Dict[str, Any]]:
-        """Get all pages for a book."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            SELECT * FROM pages 
-            WHERE book_id = ? 
-            ORDER BY page_number
-        ''', (book_id,))
-        return [dict(row) for row in cursor.fetchall()]
-    
-    def get_by_chapter(self, book_id: str, start_page: int, end_page: int) -> List[Dict[str, Any]]:
-        """Get pages for a specific chapter."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            SELECT * FROM pages 
-            WHERE book_id = ? AND page_number >= ? AND page_number <= ?
-            ORDER BY page_number
-        ''', (book_id, start_page, end_page))
-        return [dict(row) for row in cursor.fetchall()]
+    def get_by_book(self, book_id: str) -> List[sqlite3.Row]:
+        """Get all pages for a book as read-only rows (key and index access)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM pages 
+                WHERE book_id = ? 
+                ORDER BY page_number
+            ''', (book_id,))
+            return cursor.fetchall()
+    
+    def get_by_chapter(self, book_id: str, start_page: int, end_page: int) -> List[sqlite3.Row]:
+        """Get pages for a specific chapter as read-only rows (key and index access)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM pages 
+                WHERE book_id = ? AND page_number >= ? AND page_number <= ?
+                ORDER BY page_number
+            ''', (book_id, start_page, end_page))
+            return cursor.fetchall()
+    
+    def get_text_range(self, book_id: str, start_page: int, end_page: int) -> List[str]:
+        """Get the text of a page range, in page order, straight from the covering index."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_PAGE_TEXT_RANGE, (book_id, start_page, end_page))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_text_joined(self, book_id: str, start_page: int, end_page: int, separator: str = "\n\n") -> str:
+        """Get a page range's text as a single string in page order (NULL and empty pages skipped)."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            # Joined here: group_concat does not guarantee the order of its input rows
+            cursor.execute(SQL_PAGE_TEXT_RANGE, (book_id, start_page, end_page))
+            return separator.join(text for (text,) in cursor if text)
     
     def update(self, page_id: int, updates: Dict[str, Any]) -> bool:
         """Update page."""
-        cursor = self.db.cursor()
-        set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
-        values = list(updates.values()) + [page_id]
-        cursor.execute(f'UPDATE pages SET {set_clause} WHERE id = ?', values)
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            columns = tuple(sorted(updates))
+            values = [updates[c] for c in columns] + [page_id]
+            cursor.execute(_update_sql('pages', columns, 'id'), values)
+            conn.commit()
+            return cursor.rowcount > 0
     
     def delete(self, page_id: int) -> bool:
         """Delete page."""
-        cursor = self.db.cursor()
-        cursor.execute('DELETE FROM pages WHERE id = ?', (page_id,))
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM pages WHERE id = ?', (page_id,))
+            conn.commit()
+            return cursor.rowcount > 0
 
 class ProcessingLogRepository(BaseRepository):
     """Repository for processing log operations."""
     
     def create(self, log_data: Dict[str, Any]) -> int:
         """Create a new processing log."""
-        cursor = self.db.cursor()
-        cursor.execute('''
-            INSERT INTO processing_logs (book_id, stage, status, message)
-            VALUES (?, ?, ?, ?)
-        ''', (
-            log_data['book_id'],
-            log_data['stage'],
-            log_data['status'],
-            log_data.get('message')
-        ))
-        self.db.commit()
-        return cursor.lastrowid
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_INSERT_LOG, (
+                log_data['book_id'],
+                log_data['stage'],
+                log_data['status'],
+                log_data.get('message')
+            ))
+            conn.commit()
+            return cursor.lastrowid
+    
+    def create_many(self, logs: List[Dict[str, Any]]) -> int:
+        """Create many processing logs in a single transaction."""
+        return self._insert_many('processing_logs', ['book_id', 'stage', 'status', 'message'], logs)
     
     def get_by_id(self, log_id: int) -> Optional[Dict[str, Any]]:
         """Get log by ID."""
-        cursor = self.db.cursor()
-        cursor.execute('SELECT * FROM processing_logs WHERE id = ?', (log_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM processing_logs WHERE id = ?', (log_id,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
     def get_by_book(self, book_id: str) -> List[Dict[str, Any]]:
         """Get all logs for a book."""
-        cursor = self.db.cursor()
-        cursor.execute('''
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM processing_logs 
+                WHERE book_id = ? 
+                ORDER BY created_at DESC
+            ''', (book_id,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_recent(self, book_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recent logs for a book, newest first."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_RECENT_LOGS, (book_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_status_snapshot(self, book_id: str, limit: int = 10) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Get chapter status counts and the most recent logs for a book in one read transaction."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            cursor.execute(SQL_CHAPTER_STATUS_COUNTS, (book_id,))
+            counts = {row['processing_status']: row['count'] for row in cursor.fetchall()}
+            cursor.execute(SQL_RECENT_LOGS, (book_id, limit))
+            recent_logs = [dict(row) for row in cursor.fetchall()]
+            conn.commit()
+            return counts, recent_logs
+    
+    def get_recent_for_books(self, book_ids: List[str], limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most recent logs for several books in one query, newest first per book."""
+        return self._select_in(f'''
+            SELECT id, book_id, stage, status, message, created_at FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY book_id ORDER BY created_at DESC, id DESC
+                ) AS row_num
+                FROM processing_logs 
+                WHERE book_id IN ({{placeholders}})
+            ) 
+            WHERE row_num <= {int(limit)} 
+            ORDER BY book_id, created_at DESC, id DESC
+        ''', list(book_ids))
+    
+    def get_by_books(self, book_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get all logs for several books in one query."""
+        return self._select_in('''
             SELECT * FROM processing_logs 
-            WHERE book_id = ? 
-            ORDER BY created_at DESC
-        ''', (book_id,))
-        return [dict(row) for row in cursor.fetchall()]
+            WHERE book_id IN ({placeholders}) 
+            ORDER BY created_at DESC, id DESC
+        ''', list(book_ids))
     
     def update(self, log_id: int, updates: Dict[str, Any]) -> bool:
         """Update log."""
-        cursor = self.db.cursor()
-        set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
-        values = list(updates.values()) + [log_id]
-        cursor.execute(f'UPDATE processing_logs SET {set_clause} WHERE id = ?', values)
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            columns = tuple(sorted(updates))
+            values = [updates[c] for c in columns] + [log_id]
+            cursor.execute(_update_sql('processing_logs', columns, 'id'), values)
+            conn.commit()
+            return cursor.rowcount > 0
     
     def delete(self, log_id: int) -> bool:
         """Delete log."""
-        cursor = self.db.cursor()
-        cursor.execute('DELETE FROM processing_logs WHERE id = ?', (log_id,))
-        self.db.commit()
-        return cursor.rowcount > 0
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM processing_logs WHERE id = ?', (log_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+
+class ProcessingLogBuffer:
+    """Buffers processing log rows and writes them in batches."""
+    
+    def __init__(self, log_repo: ProcessingLogRepository, max_entries: int = 64, flush_interval: float = 0.5):
+        self.log_repo = log_repo
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+    
+    def _reset_after_fork(self):
+        """Drop rows inherited from the parent (it writes them itself) and replace a lock another thread may hold."""
+        self._rows = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+    
+    def append(self, row: Dict[str, Any]):
+        """Queue a log row, flushing when the buffer is full or stale."""
+        with self._lock:
+            self._rows.append(row)
+            due = (len(self._rows) >= self.max_entries or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+        # Rows flushed inside transaction() would be undone with it if it rolls back
+        if due and not self.log_repo.db_connection.in_transaction:
+            self.flush()
+    
+    def append_and_flush(self, row: Dict[str, Any]):
+        """Queue a log row and write it immediately."""
+        with self._lock:
+            self._rows.append(row)
+        self.flush()
+    
+    def flush(self):
+        """Write all buffered rows to the database."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._last_flush = time.monotonic()
+        if rows:
+            self.log_repo.create_many(rows)
 
 # Factory for creating repositories
 class RepositoryFactory:
@@ -397,6 +1262,7 @@ class RepositoryFactory:
     
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
+        self._log_buffer = None
     
     def get_book_repository(self) -> BookRepository:
         """Get book repository."""
@@ -413,6 +1279,13 @@ class RepositoryFactory:
     def get_processing_log_repository(self) -> ProcessingLogRepository:
         """Get processing log repository."""
         return ProcessingLogRepository(self.db_connection)
+    
+    def get_processing_log_buffer(self) -> ProcessingLogBuffer:
+        """Get the shared processing log buffer (flushed at interpreter exit)."""
+        if self._log_buffer is None:
+            self._log_buffer = ProcessingLogBuffer(self.get_processing_log_repository())
+            atexit.register(self._log_buffer.flush)
+        return self._log_buffer
 
 # Global instances
 db_connection = DatabaseConnection()
@@ -420,7 +1293,7 @@ repository_factory = RepositoryFactory(db_connection)
 
 # Export for easy importing
 __all__ = [
-    'DatabaseConnection', 'RepositoryFactory', 'BookRepository', 'ChapterRepository', 
-    'PageRepository', 'ProcessingLogRepository', 'BaseRepository',
+    'ConnectionPool', 'DatabaseConnection', 'RepositoryFactory', 'BookRepository', 'ChapterRepository', 
+    'PageRepository', 'ProcessingLogRepository', 'ProcessingLogBuffer', 'BaseRepository',
     'db_connection', 'repository_factory'
 ]
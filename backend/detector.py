@@ -2,25 +2,105 @@
 detector.py
 Functions for TOC validation, fuzzy matching, and heuristic fallback for chapter detection.
 """
+import copy
 import difflib
 import json
-from pathlib import Path
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MATCH_THRESHOLD = 0.6
+MAX_MATCHES = 2
+# Below this many (title, page) pairs the difflib fallback stays in-process
+PARALLEL_MIN_PAIRS = 20_000
+# Same test as text.strip().startswith("Chapter"), without copying the page text
+_CHAPTER_HEAD_RE = re.compile(r"\s*Chapter")
+
+def _file_signature(path):
+    """(path, mtime_ns, size) - changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+def _read_json(path):
+    """Parse a JSON file, read as raw bytes (orjson when available)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _fuzzy_matches(titles, page_texts):
+    """For each title, the first MAX_MATCHES page texts whose difflib ratio exceeds MATCH_THRESHOLD."""
+    if process is not None:
+        # rapidfuzz's ratio (LCS based) is never below difflib's, whose matching blocks are one
+        # common subsequence: one C-level pass over every (title, page) pair prunes the pages,
+        # and difflib confirms the survivors so both paths give the same matches
+        scores = process.cdist(titles, page_texts, scorer=fuzz.ratio,
+                               score_cutoff=MATCH_THRESHOLD * 100, workers=-1)
+        indices = [_match_title(title, page_texts, row.nonzero()[0]) for title, row in zip(titles, scores)]
+    elif len(titles) > 1 and len(titles) * len(page_texts) >= PARALLEL_MIN_PAIRS:
+        # difflib holds the GIL, so fan titles out to processes; pages are sent once per worker
+        with ProcessPoolExecutor(initializer=_init_worker_pages, initargs=(page_texts,)) as pool:
+            indices = list(pool.map(_match_title, titles))
+    else:
+        indices = [_match_title(title, page_texts) for title in titles]
+    return [[page_texts[j] for j in row] for row in indices]
+
+_worker_pages = None
+
+def _init_worker_pages(page_texts):
+    """Process pool initializer: keep the page texts for every task in this worker."""
+    global _worker_pages
+    _worker_pages = page_texts
+
+def _match_title(title, page_texts=None, candidates=None):
+    """Indices of the first MAX_MATCHES pages (of ``candidates``, default all) whose difflib
+    ratio with the title exceeds MATCH_THRESHOLD."""
+    if page_texts is None:
+        page_texts = _worker_pages
+    if candidates is None:
+        candidates = range(len(page_texts))
+    matcher = difflib.SequenceMatcher(None, title)
+    matches = []
+    for j in candidates:
+        matcher.set_seq2(page_texts[j])
+        # Cheap upper bounds first; ratio() only runs when a match is still possible
+        if (matcher.real_quick_ratio() > MATCH_THRESHOLD and matcher.quick_ratio() > MATCH_THRESHOLD
+                and matcher.ratio() > MATCH_THRESHOLD):
+            matches.append(j)
+            if len(matches) == MAX_MATCHES:
+                break
+    return matches
 
 def validate_toc(manifest_path, pages_path):
     """
     Compare TOC page numbers vs extracted page count, fuzzy match titles, adjust offset if needed.
+    Results are memoized in-process on both files' signatures.
     """
-    with open(manifest_path, encoding="utf-8") as f:
-        manifest = json.load(f)
-    with open(pages_path, encoding="utf-8") as f:
-        pages = json.load(f)
+    return copy.deepcopy(_validate_toc_cached(_file_signature(manifest_path), _file_signature(pages_path)))
+
+@lru_cache(maxsize=32)
+def _validate_toc_cached(manifest_sig, pages_sig):
+    """TOC validation memoized on both files' signatures."""
+    manifest = _read_json(manifest_sig[0])
+    pages = _read_json(pages_sig[0])
     toc = manifest.get("chapters", [])
-    page_count = len(pages)
     # Fuzzy match titles
-    for ch in toc:
-        title = ch.get("title", "")
-        matches = [p["text"] for p in pages if difflib.SequenceMatcher(None, title, p["text"]).ratio() > 0.6]
-        ch["fuzzy_matches"] = matches[:2]
+    page_texts = [p["text"] for p in pages]
+    matches = _fuzzy_matches([ch.get("title", "") for ch in toc], page_texts) if page_texts else [[] for _ in toc]
+    for ch, ch_matches in zip(toc, matches):
+        ch["fuzzy_matches"] = ch_matches
     # Offset logic placeholder
     # ...
     return toc
@@ -29,11 +109,15 @@ def heuristic_fallback(pages_path):
     """
     Detect headings if TOC missing, build chapters list.
     """
-    with open(pages_path, encoding="utf-8") as f:
-        pages = json.load(f)
+    return copy.deepcopy(_heuristic_fallback_cached(_file_signature(pages_path)))
+
+@lru_cache(maxsize=32)
+def _heuristic_fallback_cached(pages_sig):
+    """Heuristic chapter detection memoized on the pages file signature."""
+    pages = _read_json(pages_sig[0])
     chapters = []
     for i, p in enumerate(pages):
         text = p.get("text", "")
-        if text.strip().startswith("Chapter") or text.isupper():
+        if _CHAPTER_HEAD_RE.match(text) or text.isupper():
             chapters.append({"index": len(chapters)+1, "title": text.splitlines()[0], "start_page": i+1})
     return chapters
@@ -9,117 +9,356 @@ try:
 except ImportError:
     import PyMuPDF as fitz
 import os
+import re
+import sys
 import json
+import multiprocessing
+import threading
+import time
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from collections import Counter
-from dotenv import load_dotenv
-import google.generativeai as genai
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
 try:
     from .business_logic_layer import AudiobookService
     from .data_access_layer import repository_factory
+    from .utils import find_json_object, get_gemini_model
 except ImportError:
     from business_logic_layer import AudiobookService
     from data_access_layer import repository_factory
+    from utils import find_json_object, get_gemini_model
+
+# Books sent to the model per batched metadata request
+METADATA_BATCH_SIZE = 4
+METADATA_INSTRUCTIONS = """IMPORTANT: 
+- Look for table of contents, chapter headings, or section breaks
+- If no clear chapters found, create logical chapters every 8-15 pages
+- Try to identify chapter titles from headings or TOC
+- Return at least 5-10 chapters if possible
+- If you cannot find TOC, estimate chapters based on content breaks"""
+
+# Synchronous Gemini request settings: the per-attempt timeout sits just above the
+# median latency and doubles on each retry, so slow tails are cut off early
+COMPLETION_CONFIG = {
+    'request_timeout': 15.0,
+    'max_retries': 3,
+    'backoff_base': 1.0,
+}
+
+# Seconds between status checks of a Gemini batch job (BATCH_MODE=1)
+BATCH_POLL_INTERVAL = 30
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+# Covers are rendered to fit this box and stored as JPEG
+COVER_MAX_SIZE = (300, 400)
+COVER_JPEG_QUALITY = 85
+
+# Pages of front matter sent to the model for metadata and chapter detection
+FRONT_PAGES = 50
+FRONT_EDGE_PAGES = 10
+TOC_MIN_HITS = 5
+_TOC_HINT_RE = re.compile(r"(?i)\b(contents|chapter\s+\d+|part\s+[ivx]+)\b")
+
+# Starting a worker process, importing PyMuPDF and reopening the PDF costs about as much as
+# extracting a few dozen pages, so each worker gets at least PAGES_PER_WORKER pages. Anything
+# smaller than two such ranges gains nothing from a pool and stays in-process.
+PAGES_PER_WORKER = 64
+PARALLEL_MIN_PAGES = 2 * PAGES_PER_WORKER
+
+# Header/footer detection: blocks inside the top/bottom MARGIN_BAND of the page height
+# whose (number-masked) text recurs on at least MARGIN_MIN_SHARE of the pages
+MARGIN_BAND = 0.10
+MARGIN_MIN_SHARE = 0.6
+_DIGITS_RE = re.compile(r"\d+")
+
+# Lean extraction flags: clip to the page box and join words hyphenated across lines; no image
+# blocks, ligatures expanded to plain letters and odd whitespace normalized (all read better for TTS)
+_TEXT_FLAGS = getattr(fitz, "TEXT_MEDIABOX_CLIP", 64) | getattr(fitz, "TEXT_DEHYPHENATE", 16)
+
+def _page_blocks(page) -> tuple:
+    """(page height, [(y0, y1, text), ...]) for the text blocks of one PDF page, in reading order."""
+    try:
+        blocks = page.get_text("blocks", flags=_TEXT_FLAGS, sort=True)
+    except Exception:
+        blocks = page.getText("blocks") if hasattr(page, 'getText') else []
+    # Skip image blocks (block_type 1)
+    return page.rect.height, [(b[1], b[3], b[4]) for b in blocks if len(b) < 7 or b[6] == 0]
+
+# One long-lived pool for MuPDF work (front pages and cover, page-range extraction). Its workers
+# come from forkserver (spawn where that is missing), never from forking this threaded process.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_pid: Optional[int] = None
+_pdf_pool_lock = threading.Lock()
+
+def _pdf_worker_pool() -> ProcessPoolExecutor:
+    """The shared MuPDF worker pool, started on first use in this process."""
+    global _pdf_pool, _pdf_pool_pid
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                            mp_context=multiprocessing.get_context(method))
+            _pdf_pool_pid = os.getpid()
+        return _pdf_pool
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> list:
+    """Blocks of pages [start, stop); each worker opens its own document."""
+    with fitz.open(pdf_path) as doc:
+        return [_page_blocks(doc.load_page(i)) for i in range(start, stop)]
+
+@lru_cache(maxsize=4096)
+def _margin_key(text: str) -> str:
+    """Key for recurring margin blocks: trimmed text with numbers (page numbers) masked.
+    
+    Running heads repeat on almost every page, so keys are memoized and interned: each
+    distinct header is stripped and regex-masked once and hashed as a single shared object.
+    """
+    return sys.intern(_DIGITS_RE.sub("#", text.strip()))
+
+def _in_margin(y0: float, y1: float, height: float) -> bool:
+    """Whether a block lies within the header or footer band."""
+    return y1 <= height * MARGIN_BAND or y0 >= height * (1 - MARGIN_BAND)
+
+def _strip_margins(all_blocks: list) -> List[str]:
+    """Page texts from per-page blocks, with recurring header/footer blocks removed."""
+    # Margin key of every block (None for body blocks), computed once for both passes
+    page_keys = [
+        [_margin_key(text) if _in_margin(y0, y1, height) else None for y0, y1, text in blocks]
+        for height, blocks in all_blocks
+    ]
+    
+    # Headers/footers: margin blocks recurring on most pages (counted once per page);
+    # Counter consumes the flat key stream in C
+    margin_counts = Counter(key for keys in page_keys for key in set(keys) if key is not None)
+    min_pages = max(2, MARGIN_MIN_SHARE * len(all_blocks))
+    margins = {key for key, count in margin_counts.items() if count >= min_pages}
+    
+    # Join the remaining blocks of each page
+    return [
+        "\n".join(text.rstrip("\n") for (y0, y1, text), key in zip(blocks, keys) if key not in margins).strip()
+        for (height, blocks), keys in zip(all_blocks, page_keys)
+    ]
+
+def _front_texts_from_doc(doc, count: int = FRONT_PAGES) -> List[str]:
+    """Texts of the first ``count`` pages, with headers/footers detected among those pages."""
+    return _strip_margins([_page_blocks(doc.load_page(i)) for i in range(min(count, doc.page_count))])
+
+def _cover_from_doc(doc) -> Optional[Tuple[bytes, str]]:
+    """(image bytes, MIME type) of the first page rendered to fit COVER_MAX_SIZE, or None."""
+    page = doc.load_page(0)
+    
+    # Render straight at display size (the player shows covers within 300x400)
+    zoom = min(COVER_MAX_SIZE[0] / page.rect.width, COVER_MAX_SIZE[1] / page.rect.height)
+    try:
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    except Exception:
+        pix = page.getPixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False) if hasattr(page, 'getPixmap') else None
+    if pix is None:
+        return None
+    
+    # Convert to bytes
+    try:
+        return pix.tobytes("jpeg", jpg_quality=COVER_JPEG_QUALITY), 'image/jpeg'
+    except (TypeError, ValueError):
+        # PyMuPDF before 1.22 cannot encode JPEG
+        return pix.tobytes("png"), 'image/png'
+
+def _render_cover(pdf_path: str) -> Optional[Tuple[bytes, str]]:
+    """One-shot cover render."""
+    with fitz.open(pdf_path) as doc:
+        return _cover_from_doc(doc)
+
+def _extract_front(pdf_path: str) -> Tuple[Optional[Tuple[bytes, str]], List[str]]:
+    """Cover and front-page texts from a single open of the PDF; a failed cover render gives None."""
+    with fitz.open(pdf_path) as doc:
+        try:
+            cover = _cover_from_doc(doc)
+        except Exception as e:
+            print(f"Error extracting cover image: {e}")
+            cover = None
+        return cover, _front_texts_from_doc(doc)
 
 class PDFExtractor:
     """PDF extraction service using the new architecture."""
     
-    def __init__(self):
+    def __init__(self, completion_config: Optional[Dict[str, float]] = None, parallel: bool = True):
         self.audiobook_service = AudiobookService(repository_factory)
+        self.completion_config = {**COMPLETION_CONFIG, **(completion_config or {})}
+        self.metrics = Counter()
+        # Whether to fan MuPDF work out to worker processes (off inside ingest_many's workers)
+        self.parallel = parallel
     
     def extract_pages(self, pdf_path: str) -> list:
-        """Extract pages from PDF with header/footer removal."""
-        doc = fitz.open(pdf_path)
-        pages = []
-        header_counts = Counter()
-        footer_counts = Counter()
-        
-        # First pass: collect headers/footers
-        for i in range(doc.page_count):
-            page = doc.load_page(i)
-            try:
-                lines = page.get_text("text").splitlines()
-            except Exception:
-                lines = page.getText().splitlines() if hasattr(page, 'getText') else []
-            
-            if len(lines) > 2:
-                header_counts[lines[0].strip()] += 1
-                footer_counts[lines[-1].strip()] += 1
-        
-        # Detect most common header/footer
-        header = header_counts.most_common(1)[0][0] if header_counts else None
-        footer = footer_counts.most_common(1)[0][0] if footer_counts else None
+        """Extract pages from PDF with header/footer removal, as page_number/text dicts."""
+        return [{"page_number": i + 1, "text": text}
+                for i, text in enumerate(self.extract_page_texts(pdf_path))]
+    
+    def extract_page_texts(self, pdf_path: str) -> List[str]:
+        """Extract page texts from PDF with header/footer removal; page N is at index N-1."""
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+            workers = 1
+            if self.parallel and page_count >= PARALLEL_MIN_PAGES:
+                workers = min(os.cpu_count() or 1, page_count // PAGES_PER_WORKER)
+            if workers <= 1:
+                # Single extraction pass over positioned text blocks
+                all_blocks = [_page_blocks(doc.load_page(i)) for i in range(page_count)]
         
-        # Second pass: extract text, remove header/footer
-        for i in range(doc.page_count):
-            page = doc.load_page(i)
-            try:
-                lines = page.get_text("text").splitlines()
-            except Exception:
-                lines = page.getText().splitlines() if hasattr(page, 'getText') else []
-            
-            # Remove header/footer if detected
-            if header and lines and lines[0].strip() == header:
-                lines = lines[1:]
-            if footer and lines and lines[-1].strip() == footer:
-                lines = lines[:-1]
-            
-            text = "\n".join(lines).strip()
-            pages.append({"page_number": i+1, "text": text})
+        if workers > 1:
+            # MuPDF is not thread-safe, so split the pages into contiguous ranges across processes
+            step = -(-page_count // workers)
+            starts = range(0, page_count, step)
+            chunks = _pdf_worker_pool().map(_extract_page_range, [pdf_path] * len(starts), starts,
+                                            [min(start + step, page_count) for start in starts])
+            all_blocks = [blocks for chunk in chunks for blocks in chunk]
         
-        doc.close()
-        return pages
+        return _strip_margins(all_blocks)
     
     def extract_cover_image(self, pdf_path: str, book_id: str) -> bool:
         """Extract cover image from PDF and store in database."""
         try:
-            doc = fitz.open(pdf_path)
-            page = doc.load_page(0)
-            
-            try:
-                pix = page.get_pixmap()
-            except Exception:
-                pix = page.getPixmap() if hasattr(page, 'getPixmap') else None
-            
-            if pix is None:
-                print("Warning: Could not extract cover image from PDF.")
-                doc.close()
-                return False
-            
-            # Convert to bytes
-            cover_data = pix.tobytes("png")
-            doc.close()
-            
-            # Update book with cover image
-            self.audiobook_service.book_service.update_book(book_id, {
-                'cover_image_data': cover_data,
-                'cover_image_type': 'image/png'
-            })
-            
-            print(f"Saved cover image to database for book {book_id}")
-            return True
-            
+            return self._store_cover(book_id, _render_cover(pdf_path))
         except Exception as e:
             print(f"Error extracting cover image: {e}")
             return False
     
-    def extract_metadata(self, pages: list, book_id: str) -> bool:
-        """Extract metadata and chapters using AI."""
+    def _store_cover(self, book_id: str, cover: Optional[Tuple[bytes, str]]) -> bool:
+        """Save a rendered cover on the book."""
+        if cover is None:
+            print("Warning: Could not extract cover image from PDF.")
+            return False
+        
+        cover_data, cover_type = cover
+        self.audiobook_service.book_service.update_book(book_id, {
+            'cover_image_data': cover_data,
+            'cover_image_type': cover_type
+        })
+        
+        print(f"Saved cover image to database for book {book_id}")
+        return True
+    
+    def _front_text(self, texts: List[str]) -> str:
+        """
+        Front matter sent to the model. Of the first FRONT_PAGES pages only the opening and
+        closing FRONT_EDGE_PAGES and pages that look like a TOC or chapter start are kept;
+        when fewer than TOC_MIN_HITS pages look like that, all of them are sent.
+        """
+        front = texts[:FRONT_PAGES]
+        hits = {i for i, text in enumerate(front) if _TOC_HINT_RE.search(text)}
+        if len(hits) >= TOC_MIN_HITS:
+            keep = hits.union(range(FRONT_EDGE_PAGES), range(max(0, len(front) - FRONT_EDGE_PAGES), len(front)))
+        else:
+            keep = range(len(front))
+        return "\n\n".join(f"--- PAGE {i + 1} ---\n{front[i]}" for i in sorted(keep))
+    
+    @staticmethod
+    def _parse_ai_json(raw_output: str) -> dict:
+        """Parse the model's JSON answer, tolerating prose around the object."""
+        try:
+            return json.loads(raw_output)
+        except Exception:
+            block = find_json_object(raw_output)
+            if block:
+                return json.loads(block)
+            return {"error": "Could not parse AI output", "raw": raw_output}
+    
+    def _configure_model(self):
+        """Configured Gemini model, or None when no API key is available."""
+        from dotenv import load_dotenv
         load_dotenv()
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             print("Warning: GOOGLE_API_KEY missing from environment")
-            return self._create_default_metadata(pages, book_id)
-        
+            return None
+        self._api_key = api_key
+        return get_gemini_model(api_key)
+    
+    def _generate(self, model, prompt: str) -> str:
+        """
+        Model answer text. With BATCH_MODE=1 the prompt goes through the Gemini batch API
+        (cheaper, minutes of latency); otherwise, or if that fails, generate_content is used.
+        """
+        if os.getenv("BATCH_MODE") == "1":
+            try:
+                return self._generate_batch(prompt)
+            except Exception as e:
+                print(f"Batch mode failed, using synchronous request: {e}")
+        return self._generate_with_retry(model, prompt)
+    
+    def _generate_with_retry(self, model, prompt: str) -> str:
+        """generate_content with a per-attempt timeout, retried with exponential backoff on timeout."""
         try:
-            genai.configure(api_key=api_key)
-            model_name = "gemini-2.5-flash"
-            model = genai.GenerativeModel(model_name)
-            
-            # Use first 50 pages for better chapter detection
-            front_text = "\n\n".join(f"--- PAGE {p['page_number']} ---\n{p['text']}" for p in pages[:50])
-            prompt = f"""
+            from google.api_core.exceptions import DeadlineExceeded
+        except ImportError:
+            DeadlineExceeded = TimeoutError
+        config = self.completion_config
+        retries = int(config['max_retries'])
+        for attempt in range(retries + 1):
+            timeout = config['request_timeout'] * 2 ** attempt
+            try:
+                self.metrics['requests'] += 1
+                return model.generate_content(prompt, request_options={"timeout": timeout}).text
+            except (DeadlineExceeded, TimeoutError):
+                self.metrics['timeouts'] += 1
+                if attempt == retries:
+                    raise
+                print(f"Gemini request timed out after {timeout:.0f}s, retrying ({attempt + 1}/{retries})")
+                time.sleep(config['backoff_base'] * 2 ** attempt)
+    
+    def _generate_batch(self, prompt: str) -> str:
+        """Submit the prompt as an inline batch job and wait for its single response."""
+        from google import genai as genai_batch
+        client = genai_batch.Client(api_key=self._api_key)
+        job = client.batches.create(
+            model="models/gemini-2.5-flash",
+            src=[{"contents": [{"parts": [{"text": prompt}], "role": "user"}]}],
+            config={"display_name": "audiobook-metadata"},
+        )
+        while job.state.name not in BATCH_DONE_STATES:
+            time.sleep(BATCH_POLL_INTERVAL)
+            job = client.batches.get(name=job.name)
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"batch job {job.name} ended in {job.state.name}")
+        inline = job.dest.inlined_responses[0]
+        if inline.error:
+            raise RuntimeError(f"batch request failed: {inline.error}")
+        return inline.response.text
+    
+    def _apply_metadata(self, meta_json: dict, texts: List[str], book_id: str):
+        """Store extracted metadata and chapters for one book."""
+        # Update book with metadata
+        title = meta_json.get("title", "Unknown Title")
+        author = meta_json.get("author", "Unknown Author")
+        genre = meta_json.get("genre", "Unknown Genre")
+        year = meta_json.get("year", "Unknown Year")
+        
+        self.audiobook_service.book_service.update_book(book_id, {
+            'title': title,
+            'author': author,
+            'genre': genre,
+            'year': year,
+            'page_count': len(texts)
+        })
+        
+        # Add chapters
+        chapters = meta_json.get("chapters", [])
+        if chapters:
+            self.audiobook_service.add_chapters_to_book(book_id, chapters)
+            print(f"Added {len(chapters)} chapters to database")
+        else:
+            print("No chapters found, creating default chapters")
+            self._create_default_chapters(texts, book_id)
+    
+    def _request_metadata(self, texts: List[str]) -> Optional[dict]:
+        """Ask the model for metadata and chapters from the front pages; None without an API key."""
+        model = self._configure_model()
+        if model is None:
+            return None
+        
+        front_text = self._front_text(texts)
+        prompt = f"""
 You are analyzing a general narrative book to extract metadata and chapter information.
 From the following front pages (title, copyright, table of contents, introduction):
 
@@ -138,60 +377,96 @@ Return a JSON object:
   ]
 }}
 
-IMPORTANT: 
-- Look for table of contents, chapter headings, or section breaks
-- If no clear chapters found, create logical chapters every 8-15 pages
-- Try to identify chapter titles from headings or TOC
-- Return at least 5-10 chapters if possible
-- If you cannot find TOC, estimate chapters based on content breaks
-
+{METADATA_INSTRUCTIONS}
 Return only valid JSON.
 """
-            
-            response = model.generate_content(prompt)
-            raw_output = response.text
-            
-            # Try to parse JSON
-            import re
-            try:
-                meta_json = json.loads(raw_output)
-            except Exception:
-                m = re.search(r"(\{.*\})", raw_output, flags=re.S)
-                if m:
-                    meta_json = json.loads(m.group(1))
-                else:
-                    meta_json = {"error": "Could not parse AI output", "raw": raw_output}
-            
-            # Update book with metadata
-            title = meta_json.get("title", "Unknown Title")
-            author = meta_json.get("author", "Unknown Author")
-            genre = meta_json.get("genre", "Unknown Genre")
-            year = meta_json.get("year", "Unknown Year")
-            
-            self.audiobook_service.book_service.update_book(book_id, {
-                'title': title,
-                'author': author,
-                'genre': genre,
-                'year': year,
-                'page_count': len(pages)
-            })
-            
-            # Add chapters
-            chapters = meta_json.get("chapters", [])
-            if chapters:
-                self.audiobook_service.add_chapters_to_book(book_id, chapters)
-                print(f"Added {len(chapters)} chapters to database")
-            else:
-                print("No chapters found, creating default chapters")
-                self._create_default_chapters(pages, book_id)
-            
+        
+        return self._parse_ai_json(self._generate(model, prompt))
+    
+    def extract_metadata(self, texts: List[str], book_id: str) -> bool:
+        """Extract metadata and chapters using AI."""
+        try:
+            meta_json = self._request_metadata(texts)
+            if meta_json is None:
+                return self._create_default_metadata(texts, book_id)
+            self._apply_metadata(meta_json, texts, book_id)
             return True
             
         except Exception as e:
             print(f"AI extraction failed: {e}")
-            return self._create_default_metadata(pages, book_id)
+            return self._create_default_metadata(texts, book_id)
+    
+    def extract_metadata_batch(self, book_texts_map: Dict[str, List[str]]) -> Dict[str, bool]:
+        """
+        Extract metadata for several books, sending METADATA_BATCH_SIZE books per request.
+        Books missing from (or unparseable in) a batched answer fall back to extract_metadata.
+        """
+        results = {}
+        try:
+            model = self._configure_model()
+        except Exception as e:
+            print(f"AI extraction failed: {e}")
+            model = None
+        book_ids = list(book_texts_map)
+        
+        for start in range(0, len(book_ids) if model is not None else 0, METADATA_BATCH_SIZE):
+            batch = book_ids[start:start + METADATA_BATCH_SIZE]
+            if len(batch) == 1:
+                continue
+            sections = "\n\n".join(
+                f"--- BOOK {book_id} ---\n{self._front_text(book_texts_map[book_id])}" for book_id in batch
+            )
+            prompt = f"""
+You are analyzing {len(batch)} general narrative books to extract metadata and chapter information.
+Each book starts with a "--- BOOK <book_id> ---" line followed by its front pages
+(title, copyright, table of contents, introduction):
+
+{sections}
+
+Return a JSON object with one entry per book:
+{{
+  "books": [
+    {{
+      "book_id": "...",
+      "title": "...",
+      "author": "...",
+      "genre": "...",
+      "year": "...",
+      "chapters": [
+        {{"title": "Chapter 1", "start_page": 1, "end_page": 9}},
+        ...
+      ]
+    }},
+    ...
+  ]
+}}
+
+{METADATA_INSTRUCTIONS}
+- Page numbers are the PAGE numbers within each book
+Return only valid JSON.
+"""
+            try:
+                books = self._parse_ai_json(self._generate(model, prompt)).get("books", [])
+            except Exception as e:
+                print(f"Batched AI extraction failed: {e}")
+                continue
+            
+            for meta_json in books:
+                book_id = meta_json.get("book_id") if isinstance(meta_json, dict) else None
+                if book_id in batch and book_id not in results:
+                    try:
+                        self._apply_metadata(meta_json, book_texts_map[book_id], book_id)
+                        results[book_id] = True
+                    except Exception as e:
+                        print(f"Failed to store metadata for {book_id}: {e}")
+        
+        # Per-book path for singletons and anything the batched answers did not cover
+        for book_id in book_ids:
+            if book_id not in results:
+                results[book_id] = self.extract_metadata(book_texts_map[book_id], book_id)
+        return results
     
-    def _create_default_metadata(self, pages: list, book_id: str) -> bool:
+    def _create_default_metadata(self, texts: List[str], book_id: str) -> bool:
         """Create default metadata when AI extraction fails."""
         try:
             # Create minimal book entry
@@ -200,25 +475,25 @@ Return only valid JSON.
                 'author': "Unknown Author",
                 'genre': "Unknown Genre",
                 'year': "Unknown Year",
-                'page_count': len(pages)
+                'page_count': len(texts)
             })
             
             # Create default chapters
-            self._create_default_chapters(pages, book_id)
+            self._create_default_chapters(texts, book_id)
             return True
             
         except Exception as e:
             print(f"Failed to create default metadata: {e}")
             return False
     
-    def _create_default_chapters(self, pages: list, book_id: str):
+    def _create_default_chapters(self, texts: List[str], book_id: str):
         """Create default chapters when AI extraction fails."""
         default_chapters = []
-        pages_per_chapter = max(10, len(pages) // 10)  # At least 10 pages per chapter
+        pages_per_chapter = max(10, len(texts) // 10)  # At least 10 pages per chapter
         
-        for i in range(0, len(pages), pages_per_chapter):
+        for i in range(0, len(texts), pages_per_chapter):
             start_page = i + 1
-            end_page = min(i + pages_per_chapter, len(pages))
+            end_page = min(i + pages_per_chapter, len(texts))
             default_chapters.append({
                 "title": f"Chapter {len(default_chapters) + 1}",
                 "start_page": start_page,
@@ -228,33 +503,66 @@ Return only valid JSON.
         self.audiobook_service.add_chapters_to_book(book_id, default_chapters)
         print(f"Created {len(default_chapters)} default chapters")
     
+    def _submit_front(self, pdf_path: str) -> Future:
+        """Start _extract_front on the shared MuPDF pool; when not parallel, run it here."""
+        if self.parallel:
+            return _pdf_worker_pool().submit(_extract_front, pdf_path)
+        future = Future()
+        try:
+            future.set_result(_extract_front(pdf_path))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
     def process_pdf(self, pdf_path: str, book_id: str) -> bool:
         """Complete PDF processing pipeline."""
         try:
             print(f"Starting PDF processing for {book_id}")
             
-            # Step 1: Extract pages
-            print("Extracting pages...")
-            pages = self.extract_pages(pdf_path)
-            if not pages:
-                print("No pages extracted from PDF")
-                return False
-            
-            # Step 2: Add pages to database
-            print(f"Adding {len(pages)} pages to database...")
-            if not self.audiobook_service.add_pages_to_book(book_id, pages):
-                print("Failed to add pages to database")
-                return False
-            
-            # Step 3: Extract cover image
-            print("Extracting cover image...")
-            self.extract_cover_image(pdf_path, book_id)
-            
-            # Step 4: Extract metadata and chapters
-            print("Extracting metadata and chapters...")
-            if not self.extract_metadata(pages, book_id):
-                print("Failed to extract metadata")
-                return False
+            # The cover and the metadata request only need the first pages, so they run alongside
+            # the full extraction: _extract_front renders the cover and reads the front pages from
+            # a single open of the PDF (in a worker process, MuPDF is not thread-safe), the
+            # Gemini request runs on a thread
+            front_future = self._submit_front(pdf_path)
+            io_pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                meta_future = io_pool.submit(lambda: self._request_metadata(front_future.result()[1]))
+                
+                # Step 1: Extract pages
+                print("Extracting pages...")
+                texts = self.extract_page_texts(pdf_path)
+                if not texts:
+                    print("No pages extracted from PDF")
+                    return False
+                
+                # Step 2: Add pages to database
+                print(f"Adding {len(texts)} pages to database...")
+                if not self.audiobook_service.add_page_texts_to_book(book_id, texts):
+                    print("Failed to add pages to database")
+                    return False
+                
+                # Step 3: Store cover image
+                print("Extracting cover image...")
+                try:
+                    self._store_cover(book_id, front_future.result()[0])
+                except Exception as e:
+                    print(f"Error extracting cover image: {e}")
+                
+                # Step 4: Store metadata and chapters
+                print("Extracting metadata and chapters...")
+                try:
+                    meta_json = meta_future.result()
+                    if meta_json is not None:
+                        self._apply_metadata(meta_json, texts, book_id)
+                except Exception as e:
+                    print(f"AI extraction failed: {e}")
+                    meta_json = None
+                if meta_json is None and not self._create_default_metadata(texts, book_id):
+                    print("Failed to extract metadata")
+                    return False
+            finally:
+                # A failed extraction returns early; do not wait on a Gemini request nobody will read
+                io_pool.shutdown(wait=False, cancel_futures=True)
             
             print(f"PDF processing completed successfully for {book_id}")
             return True
@@ -262,15 +570,81 @@ Return only valid JSON.
         except Exception as e:
             print(f"PDF processing failed: {e}")
             return False
+    
+    def process_pdfs(self, pdf_paths: Dict[str, str]) -> Dict[str, bool]:
+        """Processing pipeline for several PDFs (book_id -> pdf_path) with batched metadata extraction."""
+        results = {}
+        book_texts_map = {}
+        for book_id, pdf_path in pdf_paths.items():
+            try:
+                print(f"Extracting pages for {book_id}...")
+                texts = self.extract_page_texts(pdf_path)
+                if not texts or not self.audiobook_service.add_page_texts_to_book(book_id, texts):
+                    print(f"Failed to extract pages for {book_id}")
+                    results[book_id] = False
+                    continue
+                self.extract_cover_image(pdf_path, book_id)
+                book_texts_map[book_id] = texts
+            except Exception as e:
+                print(f"PDF processing failed for {book_id}: {e}")
+                results[book_id] = False
+        
+        if book_texts_map:
+            print(f"Extracting metadata and chapters for {len(book_texts_map)} books...")
+            results.update(self.extract_metadata_batch(book_texts_map))
+        return results
+
+_worker_extractor = None
+
+def _ingest_worker_init():
+    """Process pool initializer: load .env once and keep one extractor (and DB connection) per worker."""
+    global _worker_extractor
+    from dotenv import load_dotenv
+    load_dotenv()
+    # Books are already spread over the pool, so each worker extracts in-process
+    _worker_extractor = PDFExtractor(parallel=False)
+
+def _ingest_one(pdf_path: str, book_id: str) -> bool:
+    """Create the book entry and run the full pipeline on this worker's extractor."""
+    service = _worker_extractor.audiobook_service
+    try:
+        if not service.create_audiobook(book_id, "Processing...", "Unknown Author"):
+            print(f"Failed to create book entry for {book_id}")
+            return False
+        return _worker_extractor.process_pdf(pdf_path, book_id)
+    finally:
+        # Pool workers exit through os._exit, so atexit never flushes their logs
+        service.processing_service.log_buffer.flush()
+
+def ingest_many(pdf_paths_and_ids: List[Tuple[str, str]], workers: Optional[int] = None) -> Dict[str, bool]:
+    """Ingest several PDFs over a pool of reused worker processes; returns book_id -> success."""
+    if not pdf_paths_and_ids:
+        return {}
+    pdf_paths, book_ids = zip(*pdf_paths_and_ids)
+    workers = min(workers or os.cpu_count() or 1, len(book_ids))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_ingest_worker_init) as pool:
+        return dict(zip(book_ids, pool.map(_ingest_one, pdf_paths, book_ids)))
 
 def main():
     """Command line interface for PDF extraction."""
     import argparse
     parser = argparse.ArgumentParser(description="Extract pages and metadata from PDF")
-    parser.add_argument("--pdf_path", type=str, required=True, help="Path to PDF file")
-    parser.add_argument("--book_id", type=str, required=True, help="Unique book ID")
+    parser.add_argument("--pdf_path", type=str, required=True, nargs="+", help="Path to PDF file(s)")
+    parser.add_argument("--book_id", type=str, required=True, nargs="+", help="Unique book ID(s), one per PDF")
     args = parser.parse_args()
     
+    if len(args.pdf_path) != len(args.book_id):
+        parser.error("--pdf_path and --book_id need the same number of values")
+    
+    if len(args.pdf_path) > 1:
+        # Several books: reuse worker processes instead of one process per book
+        results = ingest_many(list(zip(args.pdf_path, args.book_id)))
+        for pdf_path, book_id in zip(args.pdf_path, args.book_id):
+            status = "Successfully processed" if results[book_id] else "Failed to process"
+            print(f"{status} PDF: {pdf_path}")
+        return
+    args.pdf_path, args.book_id = args.pdf_path[0], args.book_id[0]
+    
     # Create book first
     audiobook_service = AudiobookService(repository_factory)
     if not audiobook_service.create_audiobook(args.book_id, "Processing...", "Unknown Author"):
@@ -6,6 +6,11 @@ Builds final manifest from database data without file dependencies.
 import json
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     from .business_logic_layer import AudiobookService
     from .data_access_layer import repository_factory
@@ -13,17 +18,25 @@ except ImportError:
     from business_logic_layer import AudiobookService
     from data_access_layer import repository_factory
 
+def _dump_json(data: Any) -> bytes:
+    """Serialize as indented UTF-8 JSON bytes (non-ASCII kept as is)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
 class ManifestBuilder:
     """Manifest builder using the new architecture."""
     
     def __init__(self):
         self.audiobook_service = AudiobookService(repository_factory)
     
-    def build_final_manifest(self, book_id: str) -> Optional[Dict[str, Any]]:
-        """Build final manifest from database data."""
+    def build_final_manifest(self, book_id: str,
+                             audiobook_info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Build final manifest from database data (pass ``audiobook_info`` to reuse an earlier fetch)."""
         try:
             # Get complete audiobook information
-            audiobook_info = self.audiobook_service.get_audiobook_info(book_id)
+            if audiobook_info is None:
+                audiobook_info = self.audiobook_service.get_audiobook_info(book_id)
             if not audiobook_info:
                 print(f"Book {book_id} not found in database")
                 return None
@@ -41,7 +54,7 @@ class ManifestBuilder:
                     "start_page": chapter["start_page"],
                     "end_page": chapter["end_page"],
                     "has_summary": bool(chapter.get("summary_text")),
-                    "has_audio": bool(chapter.get("audio_data")),
+                    "has_audio": bool(chapter.get("has_audio")),
                     "processing_status": chapter.get("processing_status", "pending")
                 }
                 final_chapters.append(chapter_data)
@@ -54,7 +67,7 @@ class ManifestBuilder:
                 "genre": book.get("genre", ""),
                 "year": book.get("year", ""),
                 "page_count": book.get("page_count", 0),
-                "has_cover": bool(book.get("cover_image_data")),
+                "has_cover": bool(book.get("has_cover")),
                 "chapters": final_chapters,
                 "processing_status": processing_status,
                 "created_at": book.get("created_at"),
@@ -67,10 +80,12 @@ class ManifestBuilder:
             print(f"Error building manifest: {e}")
             return None
     
-    def get_processing_summary(self, book_id: str) -> Dict[str, Any]:
-        """Get processing summary for a book."""
+    def get_processing_summary(self, book_id: str,
+                               audiobook_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get processing summary for a book (pass ``audiobook_info`` to reuse an earlier fetch)."""
         try:
-            audiobook_info = self.audiobook_service.get_audiobook_info(book_id)
+            if audiobook_info is None:
+                audiobook_info = self.audiobook_service.get_audiobook_info(book_id)
             if not audiobook_info:
                 return {"error": "Book not found"}
             
@@ -117,7 +132,7 @@ class ManifestBuilder:
                     "genre": book["genre"],
                     "year": book["year"],
                     "page_count": book["page_count"],
-                    "has_cover": bool(book.get("cover_image_data")),
+                    "has_cover": bool(book.get("has_cover")),
                     "created_at": book["created_at"],
                     "updated_at": book["updated_at"]
                 },
@@ -131,7 +146,7 @@ class ManifestBuilder:
                     "start_page": chapter["start_page"],
                     "end_page": chapter["end_page"],
                     "summary_text": chapter.get("summary_text", ""),
-                    "has_audio": bool(chapter.get("audio_data")),
+                    "has_audio": bool(chapter.get("has_audio")),
                     "processing_status": chapter.get("processing_status", "pending"),
                     "created_at": chapter["created_at"],
                     "updated_at": chapter["updated_at"]
@@ -159,22 +174,24 @@ def main():
         export_data = builder.export_audiobook_data(args.book_id)
         if export_data:
             output_file = f"audiobook_export_{args.book_id}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            with open(output_file, 'wb') as f:
+                f.write(_dump_json(export_data))
             print(f"Exported audiobook data to {output_file}")
         else:
             print("Failed to export audiobook data")
     else:
         # Build final manifest
-        manifest = builder.build_final_manifest(args.book_id)
+        # Fetch once for both the manifest and the summary
+        audiobook_info = builder.audiobook_service.get_audiobook_info(args.book_id)
+        manifest = builder.build_final_manifest(args.book_id, audiobook_info)
         if manifest:
             print(f"Final manifest for book {args.book_id}:")
-            print(json.dumps(manifest, indent=2, ensure_ascii=False))
+            print(_dump_json(manifest).decode('utf-8'))
             
             # Show processing summary
-            summary = builder.get_processing_summary(args.book_id)
+            summary = builder.get_processing_summary(args.book_id, audiobook_info)
             print(f"\nProcessing Summary:")
-            print(json.dumps(summary, indent=2, ensure_ascii=False))
+            print(_dump_json(summary).decode('utf-8'))
         else:
             print(f"Failed to build manifest for book {args.book_id}")
 
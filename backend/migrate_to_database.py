@@ -5,13 +5,56 @@ This script migrates all existing audiobook data from filesystem to database.
 
 import os
 import json
+import shutil
 import sqlite3
+import subprocess
+import sys
 from pathlib import Path
 from typing import List, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .data_access_layer import DatabaseConnection, repository_factory
 from .business_logic_layer import AudiobookService
 
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, read as raw bytes (orjson when available)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _chapter_files(directory: Path, suffix: str) -> List[os.DirEntry]:
+    """``chapter_*<suffix>`` files in a directory (one scandir pass, no per-file stat), sorted by name."""
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.startswith('chapter_') and e.name.endswith(suffix)]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+def _chapter_number(entry: os.DirEntry, suffix: str) -> int:
+    """Chapter number from a ``chapter_<n><suffix>`` file name."""
+    return int(entry.name[:-len(suffix)].split('_')[-1])
+
+def _clone_tree(src: Path, dst: Path) -> None:
+    """Copy a directory tree, cloning file extents on copy-on-write filesystems where possible."""
+    if dst.exists():
+        raise FileExistsError(f"Backup destination already exists: {dst}")
+    if sys.platform.startswith('linux') and shutil.which('cp'):
+        # GNU cp shares extents on Btrfs/XFS and quietly falls back to a byte copy elsewhere
+        result = subprocess.run(['cp', '-R', '--reflink=auto', '--preserve=timestamps', str(src), str(dst)],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            return
+        shutil.rmtree(dst, ignore_errors=True)
+    shutil.copytree(src, dst)
+
 class DataMigrator:
     """Migrates existing file-based data to database."""
     
@@ -27,7 +70,8 @@ class DataMigrator:
                 print("No existing data directory found. Nothing to migrate.")
                 return True
             
-            book_dirs = [d for d in self.data_dir.iterdir() if d.is_dir()]
+            with os.scandir(self.data_dir) as it:
+                book_dirs = sorted(Path(e.path) for e in it if e.is_dir())
             print(f"Found {len(book_dirs)} book directories to migrate")
             
             for book_dir in book_dirs:
@@ -60,8 +104,7 @@ class DataMigrator:
                 print(f"No manifest found for {book_id}, skipping...")
                 return True
             
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
+            manifest = _load_json(manifest_path)
             
             # Create book entry
             title = manifest.get('title', book_id)
@@ -69,88 +112,87 @@ class DataMigrator:
             genre = manifest.get('genre', 'Unknown Genre')
             year = manifest.get('year', 'Unknown Year')
             
-            # Load pages
+            # Pages are handed to SQLite as raw JSON text and unpacked there
             pages_path = book_dir / "pages.json"
-            pages = []
+            pages_json = None
             if pages_path.exists():
                 with open(pages_path, 'r', encoding='utf-8') as f:
-                    pages = json.load(f)
-            
-            # Create book in database
-            if not self.audiobook_service.create_audiobook(
-                book_id, title, author, genre, year, len(pages)
-            ):
-                print(f"Failed to create book {book_id} in database")
-                return False
-            
-            # Add pages to database
-            if pages:
-                if not self.audiobook_service.add_pages_to_book(book_id, pages):
-                    print(f"Failed to add pages for book {book_id}")
-                    return False
+                    pages_json = f.read()
             
-            # Add chapters to database
             chapters = manifest.get('chapters', [])
-            if chapters:
-                if not self.audiobook_service.add_chapters_to_book(book_id, chapters):
-                    print(f"Failed to add chapters for book {book_id}")
-                    return False
-            
-            # Migrate cover image
             cover_path = book_dir / "cover.png"
-            if cover_path.exists():
-                with open(cover_path, 'rb') as f:
-                    cover_data = f.read()
-                self.audiobook_service.book_service.update_book(book_id, {
-                    'cover_image_data': cover_data,
-                    'cover_image_type': 'image/png'
-                })
-            
-            # Migrate chapter summaries
-            chapters_dir = book_dir / "chapters"
-            if chapters_dir.exists():
-                for chapter_file in chapters_dir.glob("chapter_*.json"):
-                    try:
-                        with open(chapter_file, 'r', encoding='utf-8') as f:
-                            summary_data = json.load(f)
-                        
-                        # Extract chapter index from filename
-                        chapter_num = int(chapter_file.stem.split('_')[-1])
-                        
-                        # Find corresponding chapter in database
-                        db_chapters = self.audiobook_service.chapter_service.get_chapters(book_id)
-                        for db_chapter in db_chapters:
-                            if db_chapter['start_page'] == chapter_num:
-                                summary_text = summary_data.get('summary', '')
-                                if summary_text:
-                                    self.audiobook_service.chapter_service.update_chapter_summary(
-                                        book_id, db_chapter['chapter_index'], summary_text
-                                    )
-                                break
-                    except Exception as e:
-                        print(f"Error migrating chapter summary {chapter_file}: {e}")
-            
-            # Migrate audio files
-            audio_dir = book_dir / "audio"
-            if audio_dir.exists():
-                for audio_file in audio_dir.glob("chapter_*.wav"):
-                    try:
-                        with open(audio_file, 'rb') as f:
-                            audio_data = f.read()
+            
+            # Book, pages, chapters, cover and summaries are written as one transaction: a single
+            # commit per book, and a failure leaves nothing half-migrated
+            try:
+                with self.db_connection.transaction():
+                    # Add pages first so the book is created with their count (both land in one commit)
+                    page_count = 0
+                    if pages_json is not None:
+                        page_count = self.audiobook_service.add_pages_json_to_book(book_id, pages_json)
+                        if page_count is None:
+                            raise RuntimeError(f"Failed to add pages for book {book_id}")
+                
+                    # Create book in database
+                    if not self.audiobook_service.create_audiobook(
+                        book_id, title, author, genre, year, page_count
+                    ):
+                        raise RuntimeError(f"Failed to create book {book_id} in database")
+                
+                    # Add chapters to database
+                    if chapters and not self.audiobook_service.add_chapters_to_book(book_id, chapters):
+                        raise RuntimeError(f"Failed to add chapters for book {book_id}")
+                
+                    # Migrate cover image (streamed into the BLOB)
+                    if cover_path.exists():
+                        self.audiobook_service.book_service.set_cover_from_file(book_id, str(cover_path))
+                
+                    # Map start pages to chapter indexes once for summaries and audio. Indexes follow
+                    # manifest order (as assigned by create_chapters); the uncommitted chapters are
+                    # not visible to readers yet, so the map comes from the manifest
+                    index_by_start_page = {}
+                    for i, chapter in enumerate(chapters):
+                        index_by_start_page.setdefault(chapter.get('start_page', 1), i)
+                
+                    # Migrate chapter summaries (collected first, then written together)
+                    summaries = {}
+                    for chapter_file in _chapter_files(book_dir / "chapters", '.json'):
+                        try:
+                            summary_data = _load_json(chapter_file.path)
                         
-                        # Extract chapter number from filename
-                        chapter_num = int(audio_file.stem.split('_')[-1])
+                            # Extract chapter index from filename
+                            chapter_num = _chapter_number(chapter_file, '.json')
                         
-                        # Find corresponding chapter in database
-                        db_chapters = self.audiobook_service.chapter_service.get_chapters(book_id)
-                        for db_chapter in db_chapters:
-                            if db_chapter['start_page'] == chapter_num:
-                                self.audiobook_service.chapter_service.update_chapter_audio(
-                                    book_id, db_chapter['chapter_index'], audio_data, 'audio/wav'
-                                )
-                                break
-                    except Exception as e:
-                        print(f"Error migrating audio file {audio_file}: {e}")
+                            # Find corresponding chapter in database
+                            chapter_index = index_by_start_page.get(chapter_num)
+                            summary_text = summary_data.get('summary', '')
+                            if chapter_index is not None and summary_text:
+                                summaries[chapter_index] = summary_text
+                        except Exception as e:
+                            print(f"Error migrating chapter summary {chapter_file.path}: {e}")
+                
+                    if summaries:
+                        self.audiobook_service.chapter_service.update_chapter_summaries(book_id, summaries)
+            except Exception as e:
+                # Logged after the rollback so the entry is not undone with the book's rows
+                self.audiobook_service.processing_service.log_processing_error(book_id, 'migration', str(e))
+                raise
+            
+            # Migrate audio files (streamed per chapter after the commit, keeping large BLOBs
+            # out of the book transaction)
+            for audio_file in _chapter_files(book_dir / "audio", '.wav'):
+                try:
+                    # Extract chapter number from filename
+                    chapter_num = _chapter_number(audio_file, '.wav')
+                    
+                    # Find corresponding chapter in database and stream the file into it
+                    chapter_index = index_by_start_page.get(chapter_num)
+                    if chapter_index is not None:
+                        self.audiobook_service.chapter_service.update_chapter_audio_from_file(
+                            book_id, chapter_index, audio_file.path, 'audio/wav'
+                        )
+                except Exception as e:
+                    print(f"Error migrating audio file {audio_file.path}: {e}")
             
             print(f"Successfully migrated book: {book_id}")
             return True
@@ -163,11 +205,10 @@ class DataMigrator:
         """Create a backup of original data before migration."""
         try:
             backup_path = Path(backup_dir)
-            backup_path.mkdir(exist_ok=True)
+            backup_path.mkdir(parents=True, exist_ok=True)
             
             if self.data_dir.exists():
-                import shutil
-                shutil.copytree(self.data_dir, backup_path / "books")
+                _clone_tree(self.data_dir, backup_path / "books")
                 print(f"Original data backed up to: {backup_path}")
                 return True
             else:
@@ -195,7 +236,7 @@ class DataMigrator:
                 print(f"  - Status: {processing_status.get('overall_status', 'unknown')}")
                 
                 # Check for audio data
-                audio_chapters = [ch for ch in chapters if ch.get('audio_data')]
+                audio_chapters = [ch for ch in chapters if ch.get('has_audio')]
                 print(f"  - Audio chapters: {len(audio_chapters)}")
             
             return True
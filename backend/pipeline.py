@@ -0,0 +1,94 @@
+"""
+Audiobook Pipeline - Summarization and audio generation run as one overlapped stage
+Each chapter is handed to a TTS worker as soon as its summary arrives from Gemini,
+so speech rendering overlaps the remaining network requests.
+"""
+
+import multiprocessing
+
+try:
+    from .summarizer_new import ChapterSummarizer, SUMMARY_FLUSH_EVERY
+    from .tts_engine_new import TTSEngine, speech_text
+except ImportError:
+    from summarizer_new import ChapterSummarizer, SUMMARY_FLUSH_EVERY
+    from tts_engine_new import TTSEngine, speech_text
+
+class AudiobookPipeline:
+    """Summarizes chapters and renders their audio in a producer/consumer pipeline."""
+    
+    def __init__(self):
+        self.summarizer = ChapterSummarizer()
+        self.tts_engine = TTSEngine()
+        self.audiobook_service = self.summarizer.audiobook_service
+    
+    def process_book_chapters(self, book_id: str, max_chapters: int = None) -> bool:
+        """Summarize and voice all chapters for a book."""
+        try:
+            # Get book information
+            book = self.audiobook_service.book_service.get_book(book_id)
+            if not book:
+                print(f"Book {book_id} not found")
+                return False
+            
+            # Get chapters
+            chapters = self.audiobook_service.chapter_service.get_chapters(book_id)
+            if not chapters:
+                print(f"No chapters found for book {book_id}")
+                return False
+            
+            # Without a model there is nothing to overlap: write defaults, then render
+            model = self.summarizer.load_model()
+            if model is None:
+                return (self.summarizer.process_book_chapters(book_id, max_chapters)
+                        and self.tts_engine.process_book_chapters(book_id, max_chapters))
+            
+            chapters_to_process = chapters if max_chapters is None else chapters[:max_chapters]
+            print(f"Summarizing and voicing {len(chapters_to_process)} chapters for book {book_id}")
+            
+            # Gemini threads produce summaries; TTS processes consume them as they arrive.
+            # All database writes stay on this thread.
+            pending = {}
+            with self.tts_engine.render_pool(len(chapters_to_process)) as pool:
+                futures = {}
+                for chapter, summary_text in self.summarizer.iter_summaries(book_id, chapters_to_process, model):
+                    pending[chapter['chapter_index']] = summary_text
+                    if len(pending) >= SUMMARY_FLUSH_EVERY:
+                        self.summarizer.flush_summaries(book_id, pending)
+                    
+                    text = speech_text(chapter['title'], summary_text)
+                    futures[self.tts_engine.submit_render(pool, text)] = chapter
+                
+                self.summarizer.flush_summaries(book_id, pending)
+                self.tts_engine.save_renders(book_id, futures)
+            
+            print(f"Completed summarizing and voicing {len(chapters_to_process)} chapters")
+            return True
+            
+        except Exception as e:
+            print(f"Audiobook pipeline failed: {e}")
+            return False
+    
+    def cleanup(self):
+        """Clean up TTS engine resources."""
+        self.tts_engine.cleanup()
+
+def main():
+    """Command line interface for the summarization + audio pipeline."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Summarize chapters and generate their audio")
+    parser.add_argument("--book_id", type=str, required=True, help="Unique book ID")
+    parser.add_argument("--max_chapters", type=int, default=None, help="Max chapters to process (None for all)")
+    args = parser.parse_args()
+    
+    pipeline = AudiobookPipeline()
+    try:
+        if pipeline.process_book_chapters(args.book_id, args.max_chapters):
+            print(f"Successfully processed book {args.book_id}")
+        else:
+            print(f"Failed to process book {args.book_id}")
+    finally:
+        pipeline.cleanup()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
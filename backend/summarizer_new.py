@@ -7,15 +7,50 @@ No more file-based storage - everything goes to database.
 import os
 import sys
 import json
-from dotenv import load_dotenv
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     from .business_logic_layer import AudiobookService
     from .data_access_layer import repository_factory
+    from .utils import find_json_object, get_gemini_model
 except ImportError:
     from business_logic_layer import AudiobookService
     from data_access_layer import repository_factory
+    from utils import find_json_object, get_gemini_model
+
+# Chapters summarized between database writes; each write is one transaction
+SUMMARY_FLUSH_EVERY = 10
+# Concurrent Gemini summary requests
+SUMMARY_WORKERS = 8
+# Chapter text sent per request
+SUMMARY_TEXT_LIMIT = 12000
+# Fixed instructions, set once on the model; each request only carries the chapter
+SUMMARY_INSTRUCTIONS = """
+You are a narrator. Summarize the chapter you are given
+in a descriptive, emotional style suitable for audiobook narration.
+Keep it 150–220 words.
+Return only JSON:
+{
+"chapter_title": "<the chapter title>",
+"summary": "...",
+"tone": "emotional|calm|dramatic"
+}
+"""
+
+# Ask Gemini for a bare JSON body so the brace-scan fallback is rarely needed
+SUMMARY_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+def _parse_json(raw: str) -> Any:
+    """Parse a JSON response (orjson when available); raises ValueError on invalid JSON."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 class ChapterSummarizer:
     """Chapter summarization service using the new architecture."""
@@ -25,32 +60,19 @@ class ChapterSummarizer:
     
     def summarize_chapter(self, chapter: dict, chapter_text: str, model) -> dict:
         """Summarize a single chapter using AI."""
-        prompt = f"""
-You are a narrator. Summarize the chapter '{chapter['title']}'
-in a descriptive, emotional style suitable for audiobook narration.
-Keep it 150–220 words.
-Return only JSON:
-{{
-"chapter_title": "{chapter['title']}",
-"summary": "...",
-"tone": "emotional|calm|dramatic"
-}}
-Text:
-"""
-        prompt += chapter_text[:12000]  # Limit text length for API
+        prompt = f"Chapter title: {chapter['title']}\nText:\n{chapter_text[:SUMMARY_TEXT_LIMIT]}"
         
         try:
-            response = model.generate_content(prompt)
+            response = model.generate_content(prompt, generation_config=SUMMARY_GENERATION_CONFIG)
             raw = response.text
             
             # Try to parse JSON
-            import re
             try:
-                summary_json = json.loads(raw)
-            except Exception:
-                m = re.search(r"(\{.*\})", raw, flags=re.S)
-                if m:
-                    summary_json = json.loads(m.group(1))
+                summary_json = _parse_json(raw)
+            except ValueError:
+                block = find_json_object(raw)
+                if block:
+                    summary_json = _parse_json(block)
                 else:
                     summary_json = {
                         "chapter_title": chapter['title'], 
@@ -67,6 +89,62 @@ Text:
                 "tone": "unknown"
             }
     
+    def _summary_text(self, book_id: str, chapter: dict, model) -> str:
+        """Summary text for one chapter, or the fallback text when it is empty or fails."""
+        try:
+            # Get chapter text from database
+            chapter_text = self.audiobook_service.chapter_service.get_chapter_text(
+                book_id, chapter['start_page'], chapter['end_page']
+            )
+            
+            if not chapter_text.strip():
+                print(f"Warning: No text found for chapter {chapter['title']}")
+                return f"No content available for {chapter['title']}"
+            
+            # Generate summary using AI
+            summary_data = self.summarize_chapter(chapter, chapter_text, model)
+            return summary_data.get('summary', f"No summary generated for {chapter['title']}")
+            
+        except Exception as e:
+            print(f"Error processing chapter {chapter['title']}: {e}")
+            return f"Chapter {chapter['title']} - Summary generation failed"
+    
+    def load_model(self):
+        """Gemini model for chapter summaries, or None when no API key is configured."""
+        from dotenv import load_dotenv
+        load_dotenv()
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            print("Warning: GOOGLE_API_KEY missing from environment")
+            return None
+        return get_gemini_model(api_key, system_instruction=SUMMARY_INSTRUCTIONS)
+    
+    def iter_summaries(self, book_id: str, chapters: list, model) -> Iterator[Tuple[dict, str]]:
+        """Yield (chapter, summary text) pairs as the concurrent Gemini requests complete.
+        
+        Nothing is written here; the caller stores the summaries from its own thread.
+        """
+        total = len(chapters)
+        with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as pool:
+            futures = {
+                pool.submit(self._summary_text, book_id, chapter, model): chapter
+                for chapter in chapters
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                chapter = futures[future]
+                print(f"Summarized chapter {done}/{total}: {chapter['title']}")
+                yield chapter, future.result()
+    
+    def flush_summaries(self, book_id: str, pending: Dict[int, str]):
+        """Write the pending {chapter_index: summary} batch in one transaction and clear it."""
+        if not pending:
+            return
+        if self.audiobook_service.chapter_service.update_chapter_summaries(book_id, pending):
+            print(f"Saved {len(pending)} chapter summaries")
+        else:
+            print(f"Failed to save {len(pending)} chapter summaries")
+        pending.clear()
+    
     def process_book_chapters(self, book_id: str, max_chapters: int = None) -> bool:
         """Process all chapters for a book."""
         try:
@@ -87,52 +165,18 @@ Text:
             print(f"Processing {len(chapters_to_process)} chapters for book {book_id}")
             
             # Initialize AI model
-            load_dotenv()
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                print("Warning: GOOGLE_API_KEY missing from environment")
+            model = self.load_model()
+            if model is None:
                 return self._create_default_summaries(book_id, chapters_to_process)
             
-            genai.configure(api_key=api_key)
-            model_name = "gemini-2.5-flash"
-            model = genai.GenerativeModel(model_name)
-            
-            # Process each chapter
-            for i, chapter in enumerate(chapters_to_process):
-                try:
-                    print(f"Summarizing chapter {i+1}/{len(chapters_to_process)}: {chapter['title']}")
-                    
-                    # Get chapter text from database
-                    chapter_text = self.audiobook_service.chapter_service.get_chapter_text(
-                        book_id, chapter['start_page'], chapter['end_page']
-                    )
-                    
-                    if not chapter_text.strip():
-                        print(f"Warning: No text found for chapter {chapter['title']}")
-                        summary_text = f"No content available for {chapter['title']}"
-                    else:
-                        # Generate summary using AI
-                        summary_data = self.summarize_chapter(chapter, chapter_text, model)
-                        summary_text = summary_data.get('summary', f"No summary generated for {chapter['title']}")
-                    
-                    # Update chapter with summary in database
-                    success = self.audiobook_service.chapter_service.update_chapter_summary(
-                        book_id, chapter['chapter_index'], summary_text
-                    )
-                    
-                    if success:
-                        print(f"Summary saved for chapter {chapter['title']}")
-                    else:
-                        print(f"Failed to save summary for chapter {chapter['title']}")
-                        
-                except Exception as e:
-                    print(f"Error processing chapter {chapter['title']}: {e}")
-                    # Create fallback summary
-                    fallback_summary = f"Chapter {chapter['title']} - Summary generation failed"
-                    self.audiobook_service.chapter_service.update_chapter_summary(
-                        book_id, chapter['chapter_index'], fallback_summary
-                    )
+            # Summaries are written in batches: one transaction per SUMMARY_FLUSH_EVERY chapters
+            pending = {}
+            for chapter, summary_text in self.iter_summaries(book_id, chapters_to_process, model):
+                pending[chapter['chapter_index']] = summary_text
+                if len(pending) >= SUMMARY_FLUSH_EVERY:
+                    self.flush_summaries(book_id, pending)
             
+            self.flush_summaries(book_id, pending)
             print(f"Completed summarizing {len(chapters_to_process)} chapters")
             return True
             
@@ -143,11 +187,10 @@ Text:
     def _create_default_summaries(self, book_id: str, chapters: list) -> bool:
         """Create default summaries when AI is not available."""
         try:
-            for chapter in chapters:
-                default_summary = f"Chapter {chapter['title']} - Summary not available (AI service unavailable)"
-                self.audiobook_service.chapter_service.update_chapter_summary(
-                    book_id, chapter['chapter_index'], default_summary
-                )
+            self.audiobook_service.chapter_service.update_chapter_summaries(book_id, {
+                chapter['chapter_index']: f"Chapter {chapter['title']} - Summary not available (AI service unavailable)"
+                for chapter in chapters
+            })
             print("Created default summaries (AI service unavailable)")
             return True
         except Exception as e:
@@ -7,8 +7,16 @@ No more file-based storage - everything goes to database.
 import os
 import sys
 import io
+import json
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+import wave
 import pyttsx3
-from typing import Optional
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 
 try:
     from .business_logic_layer import AudiobookService
@@ -17,6 +25,109 @@ except ImportError:
     from business_logic_layer import AudiobookService
     from data_access_layer import repository_factory
 
+# Chapters rendered in parallel, one worker process each
+TTS_WORKERS = os.cpu_count() or 1
+# Finished renders are stored one batch per transaction, a batch closing at whichever limit
+# comes first, so the writer lock is never held for more than a few chapters' audio
+AUDIO_FLUSH_EVERY = 8
+AUDIO_FLUSH_BYTES = 64 * 1024 * 1024
+
+# Resolved voice id per voice key (None: keep the driver default), looked up once per process
+_voice_ids: Dict[str, Optional[str]] = {}
+
+def _resolve_voice_id(engine, voice: str) -> Optional[str]:
+    """Pick the driver voice id for a voice key by scanning the installed voices."""
+    voices = engine.getProperty('voices')
+    if voice == 'female':
+        for v in voices:
+            if 'female' in getattr(v, 'name', '').lower():
+                return v.id
+        return None
+    return voices[0].id if voices else None
+
+def _build_engine(voice: str = 'female'):
+    """Create a pyttsx3 engine with the given voice and audiobook speech rate."""
+    engine = pyttsx3.init()
+    
+    # Set voice (enumerating voices is slow on SAPI5, so the choice is cached)
+    if voice not in _voice_ids:
+        _voice_ids[voice] = _resolve_voice_id(engine, voice)
+    if _voice_ids[voice]:
+        engine.setProperty('voice', _voice_ids[voice])
+    
+    # Set slower speech rate for better audiobook experience
+    engine.setProperty('rate', 150)  # 150 words per minute
+    return engine
+
+def _render_to_file(engine, text: str) -> str:
+    """Render text into a new temporary WAV file and return its path (caller deletes it)."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        engine.save_to_file(text, temp_path)
+        engine.runAndWait()
+    except Exception:
+        os.unlink(temp_path)
+        raise
+    return temp_path
+
+def _piper_model() -> Optional[str]:
+    """Piper voice model to use instead of pyttsx3 (PIPER_MODEL set and piper on PATH), else None."""
+    model = os.getenv("PIPER_MODEL")
+    if model and shutil.which("piper"):
+        return model
+    return None
+
+@lru_cache(maxsize=None)
+def _piper_sample_rate(model: str) -> int:
+    """Output sample rate from the voice's <model>.json config (piper's default when absent)."""
+    try:
+        with open(f"{model}.json", 'rb') as f:
+            return int(json.load(f)["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 22050
+
+def _piper_render(model: str, text: str) -> bytes:
+    """Render text with the piper CLI and return WAV bytes, without touching the filesystem."""
+    result = subprocess.run(["piper", "--model", model, "--output-raw"],
+                            input=text.encode('utf-8'), capture_output=True, check=True)
+    # --output-raw streams 16-bit mono PCM; wrap it in a WAV header in memory
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(_piper_sample_rate(model))
+        wav.writeframes(result.stdout)
+    return buffer.getvalue()
+
+def speech_text(title: str, summary_text: Optional[str]) -> str:
+    """Text to narrate for a chapter, with a placeholder when it has no summary."""
+    if not summary_text or not summary_text.strip():
+        print(f"Warning: No summary text found for chapter {title}")
+        return f"Chapter {title} - No summary available"
+    return summary_text
+
+_worker_voice = 'female'
+
+def _tts_worker_init(voice: str):
+    """Process pool initializer: remember the voice this worker renders with."""
+    global _worker_voice
+    _worker_voice = voice
+
+def _tts_worker_render(text: str) -> str:
+    """Render one chapter's text in this worker with a fresh engine.
+    
+    Engines reused across chapters can hang on Windows, so only the resolved voice id is kept.
+    """
+    engine = _build_engine(_worker_voice)
+    try:
+        return _render_to_file(engine, text)
+    finally:
+        try:
+            engine.stop()
+        except Exception:
+            pass
+
 class TTSEngine:
     """Text-to-Speech engine using the new architecture."""
     
@@ -26,45 +137,32 @@ class TTSEngine:
     
     def _initialize_engine(self, voice: str = 'female'):
         """Initialize the TTS engine with specified voice."""
-        # Always create a fresh engine instance to avoid hangs across chapters on Windows
-        self.engine = pyttsx3.init()
-        
-        # Set voice
-        voices = self.engine.getProperty('voices')
-        if voice == 'female':
-            for v in voices:
-                if 'female' in getattr(v, 'name', '').lower():
-                    self.engine.setProperty('voice', v.id)
-                    break
-        else:
-            if voices:
-                self.engine.setProperty('voice', voices[0].id)
-        
-        # Set slower speech rate for better audiobook experience
-        self.engine.setProperty('rate', 150)  # 150 words per minute
+        # Always create a fresh engine instance to avoid hangs across calls on Windows
+        self.engine = _build_engine(voice)
     
     def generate_audio_data(self, text: str, voice: str = 'female') -> Optional[bytes]:
         """Generate audio data from text and return as bytes."""
+        model = _piper_model()
+        if model:
+            try:
+                return _piper_render(model, text)
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"Error generating audio: {e}")
+                return None
+        temp_path = self.generate_audio_file(text, voice)
+        if not temp_path:
+            return None
         try:
-            self._initialize_engine(voice)
-            
-            # Create a temporary file-like object to capture audio
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            # Generate audio to temporary file
-            self.engine.save_to_file(text, temp_path)
-            self.engine.runAndWait()
-            
-            # Read the generated audio file
             with open(temp_path, 'rb') as f:
-                audio_data = f.read()
-            
-            # Clean up temporary file
+                return f.read()
+        finally:
             os.unlink(temp_path)
-            
-            return audio_data
+    
+    def generate_audio_file(self, text: str, voice: str = 'female') -> Optional[str]:
+        """Generate audio from text into a temporary WAV file and return its path (caller deletes it)."""
+        try:
+            self._initialize_engine(voice)
+            return _render_to_file(self.engine, text)
             
         except Exception as e:
             print(f"Error generating audio: {e}")
@@ -78,6 +176,74 @@ class TTSEngine:
                 pass
             self.engine = None
     
+    def render_pool(self, chapter_count: int, voice: str = 'female') -> Executor:
+        """Executor for rendering up to chapter_count chapters.
+        
+        With piper each render is already its own process, so threads just drive the
+        subprocesses; otherwise worker processes render with pyttsx3, one engine per chapter.
+        """
+        workers = max(1, min(TTS_WORKERS, chapter_count))
+        if _piper_model():
+            return ThreadPoolExecutor(max_workers=workers)
+        return ProcessPoolExecutor(max_workers=workers, initializer=_tts_worker_init, initargs=(voice,))
+    
+    def submit_render(self, pool: Executor, text: str) -> Future:
+        """Queue text on a render pool; the future resolves to WAV bytes (piper) or a temporary WAV path."""
+        model = _piper_model()
+        if model and isinstance(pool, ThreadPoolExecutor):
+            return pool.submit(_piper_render, model, text)
+        return pool.submit(_tts_worker_render, text)
+    
+    def save_renders(self, book_id: str, futures: Dict[Future, dict]):
+        """Wait for {future: chapter} renders and store them in batches as they complete."""
+        batch = []
+        batch_bytes = 0
+        total = len(futures)
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                chapter = futures[future]
+                try:
+                    audio = future.result()
+                except Exception as e:
+                    print(f"Failed to generate audio for chapter {chapter['title']}: {e}")
+                    continue
+                print(f"Generated audio for chapter {done}/{total}: {chapter['title']}")
+                batch.append((chapter['chapter_index'], chapter['title'], audio))
+                batch_bytes += len(audio) if isinstance(audio, bytes) else os.path.getsize(audio)
+                
+                if len(batch) >= AUDIO_FLUSH_EVERY or batch_bytes >= AUDIO_FLUSH_BYTES:
+                    rendered, batch, batch_bytes = batch, [], 0
+                    self.store_renders(book_id, rendered)
+        finally:
+            # Whatever finished is still stored (and its files removed) if the loop is interrupted
+            self.store_renders(book_id, batch)
+    
+    def store_renders(self, book_id: str, rendered: List[Tuple[int, str, Union[bytes, str]]]):
+        """Store (chapter_index, title, wav) renders in one short transaction, then delete any WAV files."""
+        if not rendered:
+            return
+        chapter_service = self.audiobook_service.chapter_service
+        try:
+            with repository_factory.db_connection.transaction():
+                for chapter_index, title, audio in rendered:
+                    if isinstance(audio, bytes):
+                        success = chapter_service.update_chapter_audio(book_id, chapter_index, audio, 'audio/wav')
+                    else:
+                        success = chapter_service.update_chapter_audio_from_file(
+                            book_id, chapter_index, audio, 'audio/wav'
+                        )
+                    if success:
+                        print(f"Audio saved for chapter {title}")
+                    else:
+                        print(f"Failed to save audio for chapter {title}")
+        finally:
+            for _, _, audio in rendered:
+                if isinstance(audio, str):
+                    try:
+                        os.unlink(audio)
+                    except OSError:
+                        pass
+    
     def process_book_chapters(self, book_id: str, max_chapters: int = None) -> bool:
         """Process all chapters for a book and generate audio."""
         try:
@@ -97,36 +263,13 @@ class TTSEngine:
             chapters_to_process = chapters if max_chapters is None else chapters[:max_chapters]
             print(f"Generating audio for {len(chapters_to_process)} chapters...")
             
-            # Process each chapter
-            for i, chapter in enumerate(chapters_to_process):
-                try:
-                    print(f"Generating audio for chapter {i+1}/{len(chapters_to_process)}: {chapter['title']}")
-                    
-                    # Get summary text from database
-                    summary_text = chapter.get('summary_text', '')
-                    
-                    if not summary_text.strip():
-                        print(f"Warning: No summary text found for chapter {chapter['title']}")
-                        summary_text = f"Chapter {chapter['title']} - No summary available"
-                    
-                    # Generate audio data
-                    audio_data = self.generate_audio_data(summary_text, voice='female')
-                    
-                    if audio_data:
-                        # Update chapter with audio data in database
-                        success = self.audiobook_service.chapter_service.update_chapter_audio(
-                            book_id, chapter['chapter_index'], audio_data, 'audio/wav'
-                        )
-                        
-                        if success:
-                            print(f"Audio saved for chapter {chapter['title']}")
-                        else:
-                            print(f"Failed to save audio for chapter {chapter['title']}")
-                    else:
-                        print(f"Failed to generate audio for chapter {chapter['title']}")
-                        
-                except Exception as e:
-                    print(f"Error processing chapter {chapter['title']}: {e}")
+            # Render in worker processes, each chapter with a fresh engine
+            with self.render_pool(len(chapters_to_process)) as pool:
+                futures = {
+                    self.submit_render(pool, speech_text(chapter['title'], chapter.get('summary_text'))): chapter
+                    for chapter in chapters_to_process
+                }
+                self.save_renders(book_id, futures)
             
             print(f"Completed generating audio for {len(chapters_to_process)} chapters")
             return True
@@ -165,4 +308,5 @@ def main():
         tts_engine.cleanup()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -1,2 +1,63 @@
 # utils.py
 # Utility functions for audiobook generator
+
+from functools import lru_cache
+from typing import Optional
+
+# Leading magic bytes of the cover image formats we accept
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG', 'image/png'),
+    (b'GIF8', 'image/gif'),
+    (b'BM', 'image/bmp'),
+)
+
+def sniff_image_mime(header: bytes) -> Optional[str]:
+    """Return the image MIME type for the first 12 bytes of a file, or None if unrecognised."""
+    view = memoryview(header)
+    if view[:4] == b'RIFF' and view[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, mime in _IMAGE_SIGNATURES:
+        if view[:len(signature)] == signature:
+            return mime
+    return None
+
+def find_json_object(text: str) -> Optional[str]:
+    """Return the first complete top-level ``{...}`` in text, or None.
+    
+    A linear brace-depth scan that skips braces inside JSON strings (honouring escapes).
+    """
+    depth = 0
+    start = -1
+    in_string = escaped = False
+    for i, c in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == '\\':
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = depth > 0
+        elif c == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif c == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+@lru_cache(maxsize=4)
+def get_gemini_model(api_key: str, model_name: str = "gemini-2.5-flash",
+                     system_instruction: Optional[str] = None):
+    """Configured Gemini model, reused while the key and instruction stay the same.
+    
+    google.generativeai is imported here, on first use, so callers that never reach the
+    model (page extraction, default metadata) do not pay for loading the SDK.
+    """
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
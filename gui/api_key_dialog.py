@@ -2,15 +2,13 @@
 api_key_dialog.py
 Dialog for first-time API key setup with secure storage.
 """
-import os
-import json
-import base64
-from pathlib import Path
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QPushButton, QMessageBox, QCheckBox)
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont, QIcon
 
+from backend.config_manager import ConfigManager
+
 class APIKeyDialog(QDialog):
     """Dialog for setting up Gemini API key on first launch."""
     
@@ -189,26 +187,14 @@ class APIKeyDialog(QDialog):
         
     def load_existing_key(self):
         """Load existing API key if available."""
-        config_path = self.get_config_path()
-        if config_path.exists():
-            try:
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
-                    if 'api_key' in config:
-                        # Decode the stored key
-                        encoded_key = config['api_key']
-                        decoded_key = base64.b64decode(encoded_key).decode('utf-8')
-                        self.api_key_input.setText(decoded_key)
-                        self.show_key_checkbox.setChecked(True)
-            except Exception:
-                pass  # If loading fails, just continue with empty input
-                
-    def get_config_path(self):
-        """Get the path to the config file."""
-        config_dir = Path.home() / ".audiobook_generator"
-        config_dir.mkdir(exist_ok=True)
-        return config_dir / "config.json"
-        
+        try:
+            existing_key = ConfigManager().get_api_key()
+            if existing_key:
+                self.api_key_input.setText(existing_key)
+                self.show_key_checkbox.setChecked(True)
+        except Exception:
+            pass  # If loading fails, just continue with empty input
+            
     def save_api_key(self):
         """Save the API key securely."""
         api_key = self.api_key_input.text().strip()
@@ -218,28 +204,7 @@ class APIKeyDialog(QDialog):
             return
             
         try:
-            # Create config directory
-            config_path = self.get_config_path()
-            
-            # Encode the API key for basic obfuscation
-            encoded_key = base64.b64encode(api_key.encode('utf-8')).decode('utf-8')
-            
-            # Save config
-            config = {
-                'api_key': encoded_key,
-                'setup_completed': True,
-                'version': '1.0.0'
-            }
-            
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
-                
-            # Set file permissions to be more secure (Windows)
-            try:
-                os.chmod(config_path, 0o600)
-            except:
-                pass
-                
+            # The receiver persists the key through ConfigManager (atomic write)
             # Emit signal first, then close dialog
             self.api_key_saved.emit(api_key)
             self._signal_emitted = True
@@ -286,19 +251,7 @@ class APIKeyDialog(QDialog):
         )
         
         if reply == QMessageBox.Yes:
-            # Mark setup as completed even without API key
-            try:
-                config_path = self.get_config_path()
-                config = {
-                    'setup_completed': True,
-                    'version': '1.0.0',
-                    'api_key': None
-                }
-                with open(config_path, 'w') as f:
-                    json.dump(config, f, indent=2)
-            except:
-                pass
-                
+            # An empty key tells the receiver to mark setup as completed without one
             # Emit signal first, then close dialog
             self.api_key_saved.emit("")
             self._signal_emitted = True
@@ -3,13 +3,112 @@ Modern button components for the audiobook app.
 """
 
 from PyQt5.QtWidgets import QPushButton
-from PyQt5.QtCore import Qt, QPropertyAnimation, QRect, QEasingCurve
+from PyQt5.QtCore import Qt, QRect
 from PyQt5.QtGui import QFont, QIcon, QPalette
 
+# Stylesheets are built once and shared by every button instance
+# Primary button style (blue gradient)
+_PRIMARY_QSS = """
+    QPushButton {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #4A90E2, stop: 1 #357ABD);
+        border: none;
+        border-radius: 25px;
+        color: white;
+        padding: 12px 24px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #5BA0F2, stop: 1 #4A8ACD);
+        transform: translateY(-2px);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #357ABD, stop: 1 #2A6A9D);
+    }
+    QPushButton:disabled {
+        background: #CCCCCC;
+        color: #666666;
+    }
+"""
+
+# Secondary button style (white with border)
+_SECONDARY_QSS = """
+    QPushButton {
+        background: white;
+        border: 2px solid #4A90E2;
+        border-radius: 25px;
+        color: #4A90E2;
+        padding: 10px 24px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background: #F0F8FF;
+        border-color: #5BA0F2;
+        color: #5BA0F2;
+        transform: translateY(-2px);
+    }
+    QPushButton:pressed {
+        background: #E0F0FF;
+        border-color: #357ABD;
+        color: #357ABD;
+    }
+    QPushButton:disabled {
+        background: #F5F5F5;
+        border-color: #CCCCCC;
+        color: #999999;
+    }
+"""
+
+# Action-specific styles
+_ACTION_QSS = {
+    "success": """
+    QPushButton {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #28A745, stop: 1 #1E7E34);
+        border: none;
+        border-radius: 25px;
+        color: white;
+        padding: 12px 24px;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #34CE57, stop: 1 #28A745);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #1E7E34, stop: 1 #155724);
+    }
+""",
+    "info": """
+    QPushButton {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #17A2B8, stop: 1 #138496);
+        border: none;
+        border-radius: 25px;
+        color: white;
+        padding: 12px 24px;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #20C997, stop: 1 #17A2B8);
+    }
+    QPushButton:pressed {
+        background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
+                                   stop: 0 #138496, stop: 1 #0F6674);
+    }
+""",
+}
+
 class ModernButton(QPushButton):
     """A modern, styled button with hover effects."""
     
-    def __init__(self, text, icon=None, primary=False, size="large"):
+    def __init__(self, text, icon=None, primary=False, size="large", stylesheet=None):
         super().__init__(text)
         
         # Set button properties
@@ -22,12 +121,9 @@ class ModernButton(QPushButton):
             self.setIconSize(icon.actualSize(icon.availableSizes()[0]))
         
         # Apply styling
-        self._apply_styling(primary, size)
-        
-        # Add hover animation
-        self._setup_animation()
+        self._apply_styling(primary, size, stylesheet)
     
-    def _apply_styling(self, primary, size):
+    def _apply_styling(self, primary, size, stylesheet=None):
         """Apply modern styling to the button."""
         
         # Font
@@ -35,66 +131,9 @@ class ModernButton(QPushButton):
         font = QFont("Segoe UI", font_size, QFont.Bold)
         self.setFont(font)
         
-        if primary:
-            # Primary button style (blue gradient)
-            self.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #4A90E2, stop: 1 #357ABD);
-                    border: none;
-                    border-radius: 25px;
-                    color: white;
-                    padding: 12px 24px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #5BA0F2, stop: 1 #4A8ACD);
-                    transform: translateY(-2px);
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #357ABD, stop: 1 #2A6A9D);
-                }
-                QPushButton:disabled {
-                    background: #CCCCCC;
-                    color: #666666;
-                }
-            """)
-        else:
-            # Secondary button style (white with border)
-            self.setStyleSheet("""
-                QPushButton {
-                    background: white;
-                    border: 2px solid #4A90E2;
-                    border-radius: 25px;
-                    color: #4A90E2;
-                    padding: 10px 24px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background: #F0F8FF;
-                    border-color: #5BA0F2;
-                    color: #5BA0F2;
-                    transform: translateY(-2px);
-                }
-                QPushButton:pressed {
-                    background: #E0F0FF;
-                    border-color: #357ABD;
-                    color: #357ABD;
-                }
-                QPushButton:disabled {
-                    background: #F5F5F5;
-                    border-color: #CCCCCC;
-                    color: #999999;
-                }
-            """)
-    
-    def _setup_animation(self):
-        """Setup hover animation."""
-        self.animation = QPropertyAnimation(self, b"geometry")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.OutQuad)
+        if stylesheet is None:
+            stylesheet = _PRIMARY_QSS if primary else _SECONDARY_QSS
+        self.setStyleSheet(stylesheet)
 
 class IconButton(ModernButton):
     """A button with an icon and text."""
@@ -108,48 +147,5 @@ class ActionButton(ModernButton):
     
     def __init__(self, text, action_type="primary"):
         primary = action_type == "primary"
-        super().__init__(text, primary=primary, size="large")
-        
-        # Add action-specific styling
-        if action_type == "success":
-            self.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #28A745, stop: 1 #1E7E34);
-                    border: none;
-                    border-radius: 25px;
-                    color: white;
-                    padding: 12px 24px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #34CE57, stop: 1 #28A745);
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #1E7E34, stop: 1 #155724);
-                }
-            """)
-        elif action_type == "info":
-            self.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #17A2B8, stop: 1 #138496);
-                    border: none;
-                    border-radius: 25px;
-                    color: white;
-                    padding: 12px 24px;
-                    font-weight: bold;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #20C997, stop: 1 #17A2B8);
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
-                                               stop: 0 #138496, stop: 1 #0F6674);
-                }
-            """)
+        # Action-specific styling replaces the primary/secondary style
+        super().__init__(text, primary=primary, size="large", stylesheet=_ACTION_QSS.get(action_type))
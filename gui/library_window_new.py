@@ -53,20 +53,26 @@ class AudiobookDownloader(QThread):
             
             # Create output directory
             book_output_dir = Path(self.output_dir) / f"{safe_title}_audiobook"
-            book_output_dir.mkdir(exist_ok=True)
+            book_output_dir.mkdir(parents=True, exist_ok=True)
             
             self.progress_updated.emit(10, "Collecting audio files...")
             
             # Collect all audio files from database
             audio_files = []
             temp_audio_files = []
+            chapter_file_name = "chapter_{:03d}.wav".format
             
             for chapter in chapters:
-                if chapter.get('audio_data'):
-                    # Create temporary file for audio data
-                    temp_audio_path = book_output_dir / f"chapter_{chapter['chapter_index']:03d}.wav"
+                if chapter.get('has_audio'):
+                    # Stream audio data into a temporary file
+                    temp_audio_path = book_output_dir / chapter_file_name(chapter['chapter_index'])
                     with open(temp_audio_path, 'wb') as f:
-                        f.write(chapter['audio_data'])
+                        audio_format = self.audiobook_service.chapter_service.export_chapter_audio(
+                            self.book_id, chapter['chapter_index'], f
+                        )
+                    if not audio_format:
+                        temp_audio_path.unlink()
+                        continue
                     audio_files.append(temp_audio_path)
                     temp_audio_files.append(temp_audio_path)
             
@@ -209,7 +215,7 @@ class LibraryWindow(QWidget):
                         "start_page": ch["start_page"],
                         "end_page": ch["end_page"],
                         "has_summary": bool(ch.get("summary_text")),
-                        "has_audio": bool(ch.get("audio_data")),
+                        "has_audio": bool(ch.get("has_audio")),
                         "processing_status": ch.get("processing_status", "pending")
                     })
                 
@@ -309,7 +315,7 @@ class LibraryWindow(QWidget):
             return
         
         chapters = audiobook_info['chapters']
-        audio_chapters = [ch for ch in chapters if ch.get('audio_data')]
+        audio_chapters = [ch for ch in chapters if ch.get('has_audio')]
         
         if not audio_chapters:
             QMessageBox.warning(
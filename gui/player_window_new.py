@@ -226,19 +226,18 @@ class PlayerWindow(QWidget):
             chapter = self.chapters[self.current_chapter]
             self.status_label.setText(f"Playing {chapter['title']}")
             
-            # Get audio data from database
-            audio_data, audio_format = self.audiobook_service.chapter_service.get_chapter_audio(
-                self.book_id, chapter.get('index', self.current_chapter)
-            )
+            # Stream audio from the database into a temporary file
+            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+            try:
+                audio_format = self.audiobook_service.chapter_service.export_chapter_audio(
+                    self.book_id, chapter.get('index', self.current_chapter), temp_file
+                )
+            finally:
+                temp_file.close()
+            self.temp_audio_files.append(temp_file.name)
             
-            if audio_data:
+            if audio_format:
                 try:
-                    # Create temporary file for audio
-                    temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                    temp_file.write(audio_data)
-                    temp_file.close()
-                    self.temp_audio_files.append(temp_file.name)
-                    
                     # Play audio
                     from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
                     from PyQt5.QtCore import QUrl
@@ -65,33 +65,20 @@ class ProcessingWorker(QThread):
                 self.error.emit("No chapters found after extraction")
                 return
             
-            # Step 3: Summarize chapters
-            self.progress_updated.emit(30, f"Starting summarization of {total_chapters} chapters...")
+            # Step 3: Summarize chapters and generate audio (overlapped per chapter)
+            self.progress_updated.emit(30, f"Summarizing and voicing {total_chapters} chapters...")
             try:
-                from backend.summarizer_new import ChapterSummarizer
-                summarizer = ChapterSummarizer()
+                from backend.pipeline import AudiobookPipeline
+                pipeline = AudiobookPipeline()
                 
-                if not summarizer.process_book_chapters(self.book_id):
-                    self.error.emit("Chapter summarization failed")
+                if not pipeline.process_book_chapters(self.book_id):
+                    self.error.emit("Chapter summarization and audio generation failed")
                     return
             except Exception as e:
-                self.error.emit(f"Chapter summarization failed: {str(e)}")
+                self.error.emit(f"Chapter summarization and audio generation failed: {str(e)}")
                 return
             
-            # Step 4: Generate audio
-            self.progress_updated.emit(70, f"Starting audio generation for {total_chapters} chapters...")
-            try:
-                from backend.tts_engine_new import TTSEngine
-                tts_engine = TTSEngine()
-                
-                if not tts_engine.process_book_chapters(self.book_id):
-                    self.error.emit("Audio generation failed")
-                    return
-            except Exception as e:
-                self.error.emit(f"Audio generation failed: {str(e)}")
-                return
-            
-            # Step 5: Build final manifest
+            # Step 4: Build final manifest
             self.progress_updated.emit(90, "Building final manifest...")
             try:
                 from backend.manifest_final_new import ManifestBuilder
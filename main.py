@@ -1,6 +1,7 @@
 # main.py
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QMessageBox, QDialog
 from PyQt5.QtCore import Qt
 from gui.home_window import HomeWindow
@@ -71,5 +72,7 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # Extraction and TTS worker processes re-run this entry point in a frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
 